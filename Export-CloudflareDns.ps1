@@ -1,10 +1,18 @@
 [CmdletBinding()]
 param(
     [string]$Token,
-    [string]$OutputFile = 'zone_dns_summary.csv'
+    [string]$OutputFile = 'zone_dns_summary.csv',
+    # Zones processed concurrently (PowerShell 7+; 5.1 runs serially). Cloudflare
+    # allows 1200 requests / 5 min per token, so keep this small.
+    [ValidateRange(1, 16)]
+    [int]$ThrottleLimit = 4
 )
 
-# Shared Logic (Should ideally be in a module, but copying for standalone behavior within repo structure)
+# REST plumbing comes from the shared library (issue #778); each parallel
+# runspace dot-sources it again, so keep the path in a variable.
+$CfLibPath = Join-Path $PSScriptRoot 'scripts/cloudflare-api-common.ps1'
+. $CfLibPath
+
 function Get-AuthToken {
     if ($Token) { return $Token.Trim() }
 
@@ -25,27 +33,76 @@ function Get-AuthToken {
     throw 'No Cloudflare API token found. Pass -Token or set CLOUDFLARE_API_TOKEN (or CLOUDFLARE_API_TOKEN_FFC / CLOUDFLARE_API_TOKEN_CM).'
 }
 
-function Invoke-CfApi {
-    param([string]$Method, [string]$Uri, [hashtable]$Params, [object]$Body)
-    $t = Get-AuthToken
-    $headers = @{ Authorization = "Bearer $t" }
-    $baseUrl = "https://api.cloudflare.com/client/v4"
-    $url = "$baseUrl$Uri"
-    
-    try {
-        $response = Invoke-RestMethod -Method $Method -Uri $url -Headers $headers -Body ($Body | ConvertTo-Json -Depth 10) -ErrorAction Stop -ContentType 'application/json'
-        if (-not $response.success) { throw "API Error: $($response.errors | ConvertTo-Json -Depth 5)" }
-        return $response
+function Get-ZoneSummary {
+    <#
+        One CSV row for one zone. Uses only the shared library and its own
+        parameters so it can run inside a ForEach-Object -Parallel runspace.
+    #>
+    param(
+        [Parameter(Mandatory = $true)][string]$ZoneName,
+        [Parameter(Mandatory = $true)][string]$ZoneId,
+        [Parameter(Mandatory = $true)][string]$AuthToken
+    )
+
+    # One listing per zone (a single page for any real zone) and split it
+    # locally, rather than one filtered GET per record type. Pages are
+    # fetched one at a time: this already runs inside the -ThrottleLimit
+    # zone workers, and a page fan-out per worker would multiply the two.
+    $records = @(Get-CfDnsRecords -ZoneId $ZoneId -Token $AuthToken -ThrottleLimit 1 -Conditional)
+    $wwwName = "www.$ZoneName"
+    $apexA = @($records | Where-Object { $_.type -eq 'A' -and $_.name -eq $ZoneName })
+    $wwwCname = @($records | Where-Object { $_.type -eq 'CNAME' -and $_.name -eq $wwwName })
+    $mx = @($records | Where-Object { $_.type -eq 'MX' -and $_.name -eq $ZoneName })
+
+    [PSCustomObject]@{
+        zone              = $ZoneName
+        apex_a_ips        = ($apexA.content -join ';')
+        apex_a_proxied    = ($apexA.proxied -join ';')
+        www_cname_target  = if ($wwwCname) { $wwwCname[0].content } else { "" }
+        www_cname_proxied = if ($wwwCname) { $wwwCname[0].proxied } else { "" }
+        # Quick compliance check: MX points at Exchange Online.
+        m365_compliant    = [bool]($mx | Where-Object { $_.content -like '*.mail.protection.outlook.com' })
     }
-    catch {
-        Write-Error "Request Failed: $($_.Exception.Message)"
-        if ($_.Exception.Response) {
-            $stream = $_.Exception.Response.GetResponseStream()
-            $reader = [System.IO.StreamReader]::new($stream)
-            $body = $reader.ReadToEnd()
-            Write-Error "API Error Body: $body"
+}
+
+function Get-AllZones {
+    <#
+        Every zone the token can see, emitted page by page as each page
+        arrives, so per-zone work starts before the listing has finished.
+    #>
+    param([Parameter(Mandatory = $true)][string]$AuthToken)
+
+    $page = 1
+    $perPage = 50
+    do {
+        Write-Host "Fetching zones page $page..."
+        # Conditional: a cron re-export of an unchanged account gets 304s.
+        $resp = Invoke-CfApi -Method 'GET' -Token $AuthToken -Path "/zones?per_page=$perPage&page=$page" -Conditional
+        $resp.result
+        $info = $resp.result_info
+        $page++
+    } while ($page -le $info.total_pages)
+}
+
+function Group-ZoneBatch {
+    <#
+        Regroups the zone stream into arrays of up to -Size zones, still
+        emitting each batch as soon as it fills.
+    #>
+    param(
+        [Parameter(Mandatory = $true)][int]$Size,
+        [Parameter(ValueFromPipeline = $true)]$Zone
+    )
+    begin { $batch = [System.Collections.Generic.List[object]]::new() }
+    process {
+        $batch.Add($Zone)
+        if ($batch.Count -ge $Size) {
+            , $batch.ToArray()
+            $batch.Clear()
         }
-        throw
+    }
+    end {
+        if ($batch.Count) { , $batch.ToArray() }
     }
 }
 
@@ -53,76 +110,69 @@ function Invoke-CfApi {
 
 Write-Host "Starting DNS Summary Export..." -ForegroundColor Cyan
 
-# 1. Get All Zones (Pagination)
-$zones = @()
-$page = 1
-$perPage = 50
-do {
-    Write-Host "Fetching zones page $page..." -NoNewline
-    $resp = Invoke-CfApi -Method 'GET' -Uri "/zones?per_page=$perPage&page=$page"
-    $batch = $resp.result
-    $zones += $batch
-    $info = $resp.result_info
-    Write-Host " Found $($batch.Count) zones." -ForegroundColor Green
-    $page++
-} while ($page -le $info.total_pages)
-
-Write-Host "Total Zones found: $($zones.Count)" -ForegroundColor Cyan
-
-$results = @()
-
-foreach ($z in $zones) {
-    $zName = $z.name
-    $zId = $z.id
-    Write-Host "Processing $zName..." -NoNewline
-    
-    try {
-        # Fetch Records
-        # We need Apex A, Apex AAAA, WWW CNAME, and counts of others.
-        # Simplest is to fetch ALL records for the zone (up to a limit, say 500?)
-        # Or filter efficiently. Python script did multiple queries. Let's do that for safety.
-        
-        # Apex A
-        $apexA = (Invoke-CfApi -Method 'GET' -Uri "/zones/$zId/dns_records?type=A&name=$zName&per_page=100").result
-        # Apex AAAA
-        $apexAAAA = (Invoke-CfApi -Method 'GET' -Uri "/zones/$zId/dns_records?type=AAAA&name=$zName&per_page=100").result
-        # WWW CNAME
-        $wwwName = "www.$zName"
-        $wwwCname = (Invoke-CfApi -Method 'GET' -Uri "/zones/$zId/dns_records?type=CNAME&name=$wwwName&per_page=5").result
-        
-        # Counts (approximation using metadata if possible, but API doesn't give counts easily without list)
-        # We will fetch 'other' via broad queries if needed, or just skip advanced counts for speed/simplicity 
-        # unless user demanded strictly identical output. The python script did it.
-        # Let's verify M365 instead of counts? 
-        # The user's request was "status of them".
-        # Let's stick to the Python script's schema: Apex A, WWW Target.
-        
-        $obj = [PSCustomObject]@{
-            zone              = $zName
-            apex_a_ips        = ($apexA.content -join ';')
-            apex_a_proxied    = ($apexA.proxied -join ';')
-            www_cname_target  = if ($wwwCname) { $wwwCname[0].content } else { "" }
-            www_cname_proxied = if ($wwwCname) { $wwwCname[0].proxied } else { "" }
-            # Add Audit Check!
-            m365_compliant    = $false
+$authToken = Get-AuthToken
+$useParallel = ($PSVersionTable.PSVersion.Major -ge 7 -and $ThrottleLimit -gt 1)
+$summaryFn = ${function:Get-ZoneSummary}.ToString()
+# Zones per parallel worker: large enough to reuse a connection, small enough
+# that a 50-zone listing page still spreads across the workers.
+$zoneBatchSize = 8
+
+# Zones stream from the listing straight into the per-zone lookups, so the
+# lookups start before the listing has finished. Every zone is independent
+# and the time is all spent waiting on Cloudflare, so the lookups fan out
+# across runspaces where PowerShell allows it. A worker takes a small batch
+# of zones rather than one: every runspace starts with a fresh library (and
+# so a fresh web session), and the batch lets its zones share one keep-alive
+# connection. Each zone yields an outcome object rather than throwing, so one
+# bad zone is reported without losing the others. Workers finish in any
+# order, so the rows (one small object per zone) are sorted by zone before
+# they are written: the same account always produces the same CSV.
+if ($useParallel) {
+    Write-Host "Processing zones $ThrottleLimit at a time..." -ForegroundColor Cyan
+}
+$zoneCount = 0
+$exported = 0
+& {
+    if ($useParallel) {
+        Get-AllZones -AuthToken $authToken | Group-ZoneBatch -Size $zoneBatchSize | ForEach-Object -ThrottleLimit $ThrottleLimit -Parallel {
+            $lib = $using:CfLibPath
+            . $lib
+            ${function:Get-ZoneSummary} = $using:summaryFn
+            $token = $using:authToken
+
+            foreach ($zone in $_) {
+                try {
+                    $row = Get-ZoneSummary -ZoneName $zone.name -ZoneId $zone.id -AuthToken $token
+                    [PSCustomObject]@{ Zone = $zone.name; Row = $row; Error = $null }
+                }
+                catch {
+                    [PSCustomObject]@{ Zone = $zone.name; Row = $null; Error = "$_" }
+                }
+            }
         }
-        
-        # Quick Compliance Check (Bonus feature since previous workflow didn't have it but user complained about status)
-        # Check if MX points to outlook
-        $mx = (Invoke-CfApi -Method 'GET' -Uri "/zones/$zId/dns_records?type=MX&name=$zName").result
-        if ($mx -and $mx.content -like '*.mail.protection.outlook.com') {
-            $obj.m365_compliant = $true
+    }
+    else {
+        Get-AllZones -AuthToken $authToken | ForEach-Object {
+            $zone = $_
+            Write-Host "Processing $($zone.name)..."
+            try {
+                $row = Get-ZoneSummary -ZoneName $zone.name -ZoneId $zone.id -AuthToken $authToken
+                [PSCustomObject]@{ Zone = $zone.name; Row = $row; Error = $null }
+            }
+            catch {
+                [PSCustomObject]@{ Zone = $zone.name; Row = $null; Error = "$_" }
+            }
         }
-
-        $results += $obj
-        Write-Host " Done." -ForegroundColor Green
-        
     }
-    catch {
-        Write-Error "Failed to process $zName : $_"
+} | ForEach-Object {
+    $zoneCount++
+    if ($_.Error) {
+        Write-Error "Failed to process $($_.Zone) : $($_.Error)"
+        return
     }
-}
+    $exported++
+    $_.Row
+} | Sort-Object zone | Export-Csv -Path $OutputFile -NoTypeInformation -Encoding utf8
 
-# Export
-$results | Export-Csv -Path $OutputFile -NoTypeInformation -Encoding utf8
+Write-Host "Processed $exported/$zoneCount zones." -ForegroundColor Green
 Write-Host "Exported to $OutputFile" -ForegroundColor Cyan
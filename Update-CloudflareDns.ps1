@@ -35,6 +35,11 @@
     - $env:CLOUDFLARE_API_TOKEN (single-token mode)
     - $env:CLOUDFLARE_API_TOKEN_FFC / $env:CLOUDFLARE_API_TOKEN_CM (dual-token mode; auto-detects which can access the zone)
 
+.PARAMETER RefreshZoneCache
+    Look the zone id up again instead of trusting the on-disk zone cache
+    (24h; see Get-CfZoneCachePath in scripts/cloudflare-api-common.ps1). The
+    fresh id replaces the cached one.
+
 .PARAMETER DryRun
     Preview changes without applying them.
 
@@ -188,15 +193,18 @@ param(
 
     [string]$Token,
 
+    [switch]$RefreshZoneCache,
+
     [switch]$DryRun
 )
 
 $ErrorActionPreference = 'Stop'
 $ApiBase = 'https://api.cloudflare.com/client/v4'
 
-# Shared Cloudflare helpers (#778): single source for the GitHub Pages IP sets
-# and the www CNAME target. NOTE: this engine intentionally keeps its own
-# richer Invoke-CfApi (defined below, which overrides the library's version);
+# Shared Cloudflare helpers (#778): single source for the GitHub Pages IP sets,
+# the www CNAME target and the shared web session ($script:CfWebSession, used
+# by every call below). NOTE: this engine intentionally keeps its own richer
+# Invoke-CfApi (defined below, which overrides the library's version);
 # converging the REST plumbing is deferred to a follow-up to keep this change
 # reviewable.
 . (Join-Path $PSScriptRoot 'scripts/cloudflare-api-common.ps1')
@@ -206,6 +214,31 @@ if ($ProxyGitHubPages) {
     Write-Warning "-ProxyGitHubPages is set: proxied (orange-cloud) apex records MASK GitHub Pages behind Cloudflare edge IPs and BLOCK Let's Encrypt certificate issuance for the custom domain (observed live during the first cutover — issue #774). The FFC GitHub Pages standard is DNS-only (grey cloud); only proceed if you intend Cloudflare to front this site."
 }
 
+function Test-DnsIpContent {
+    # True when Content is a literal address of the record's family: IPv4 for
+    # A, IPv6 for AAAA. TryParse alone is too lenient for A -- it takes '1' or
+    # '10.1' as shorthand -- so an A value must also be four dotted parts. A
+    # scoped IPv6 ('fe80::1%eth0') parses but Cloudflare refuses it.
+    param(
+        [Parameter(Mandatory = $true)][ValidateSet('A', 'AAAA')][string]$Type,
+        [Parameter(Mandatory = $true)][AllowEmptyString()][string]$Content
+    )
+
+    $ip = $null
+    if (-not [System.Net.IPAddress]::TryParse($Content, [ref]$ip)) { return $false }
+    if ($Type -eq 'A') {
+        return ($ip.AddressFamily -eq [System.Net.Sockets.AddressFamily]::InterNetwork -and $Content -match '^\d{1,3}(\.\d{1,3}){3}$')
+    }
+    return ($ip.AddressFamily -eq [System.Net.Sockets.AddressFamily]::InterNetworkV6 -and $Content -notmatch '%')
+}
+
+# Reject a malformed address before any token probe or zone lookup is spent on
+# it; Cloudflare would only refuse it at the write.
+if ($Content -and $Type -in @('A', 'AAAA') -and -not (Test-DnsIpContent -Type $Type -Content $Content)) {
+    Write-Error "Invalid $Type content '$Content': expected a literal $(if ($Type -eq 'A') { 'IPv4' } else { 'IPv6' }) address."
+    exit 1
+}
+
 # --- Authenticate ---
 function Get-AuthToken {
     param([AllowNull()][string]$ZoneName)
@@ -226,6 +259,14 @@ function Get-AuthToken {
         return $candidates[0]
     }
 
+    # A token that resolved this zone recently (on-disk cache, see
+    # Get-ZoneId) is picked without probing any of them.
+    if (-not $RefreshZoneCache) {
+        foreach ($cand in $candidates) {
+            if (Read-CfZoneCache -Domain $ZoneName -Token $cand) { return $cand }
+        }
+    }
+
     foreach ($cand in $candidates) {
         if (Test-ZoneAccess -ZoneName $ZoneName -CandidateToken $cand) {
             return $cand
@@ -235,6 +276,9 @@ function Get-AuthToken {
     throw "Cloudflare API token not found for zone '$ZoneName'. Pass -Token or set the correct CLOUDFLARE_API_TOKEN_* environment variable for that zone."
 }
 
+# Zone ids learned while picking a token (see Test-ZoneAccess).
+$script:ZoneIdByName = @{}
+
 function Test-ZoneAccess {
     param(
         [Parameter(Mandatory = $true)][string]$ZoneName,
@@ -242,11 +286,19 @@ function Test-ZoneAccess {
     )
 
     try {
-        $headers = @{ Authorization = "Bearer $CandidateToken"; 'Content-Type' = 'application/json' }
+        $headers = Get-CfRequestHeaders -Token $CandidateToken
         $encoded = [uri]::EscapeDataString($ZoneName)
-        $uri = "$ApiBase/zones?name=$encoded"
-        $resp = Invoke-RestMethod -Method Get -Uri $uri -Headers $headers -ErrorAction Stop -TimeoutSec 30
-        return ($resp.success -and $resp.result -and $resp.result.Count -gt 0)
+        # Only result[0] is used, so ask for just that one.
+        $uri = "$ApiBase/zones?name=$encoded&per_page=1"
+        $resp = Invoke-RestMethod -Method Get -Uri $uri -Headers $headers -WebSession $script:CfWebSession -ErrorAction Stop -TimeoutSec 30
+        $found = ($resp.success -and $resp.result -and $resp.result.Count -gt 0)
+        # The probe already returned the zone id; Get-ZoneId reuses it rather
+        # than asking Cloudflare the same question again.
+        if ($found) {
+            $script:ZoneIdByName[$ZoneName.ToLowerInvariant()] = $resp.result[0].id
+            Write-CfZoneCache -Domain $ZoneName -Token $CandidateToken -ZoneId $resp.result[0].id -ZoneName $resp.result[0].name
+        }
+        return $found
     }
     catch {
         return $false
@@ -256,67 +308,96 @@ function Test-ZoneAccess {
 $AuthToken = Get-AuthToken -ZoneName $Zone
 if (-not $AuthToken) { Write-Error "No Cloudflare API Token provided."; exit 1 }
 
-$Headers = @{
-    'Authorization' = "Bearer $AuthToken"
-    'Content-Type'  = 'application/json'
-}
+# The library's cached per-token headers (read-only: shared with Test-ZoneAccess).
+$Headers = Get-CfRequestHeaders -Token $AuthToken
 
 # --- Helper Functions ---
 
+# -SkipHttpErrorCheck arrived in PowerShell 7.0. Decided from the version:
+# probing it with Get-Command builds the cmdlet's full parameter metadata,
+# which is a noticeable share of this script's start-up.
+$script:CanSkipHttpErrors = ($PSVersionTable.PSVersion.Major -ge 7)
+
 function Invoke-CfApi {
     param(
         [string]$Method,
         [string]$Uri,
         [hashtable]$Body = $null,
-        [hashtable]$Params = $null
+        [hashtable]$Params = $null,
+        # GET only: revalidate against the on-disk ETag cache (If-None-Match)
+        # and reuse the cached body on 304. Needs the PowerShell 7 path below.
+        [switch]$Conditional
     )
 
+    # URL and JSON body are built once, whichever transport sends them.
+    $requestUri = "$ApiBase$Uri"
+    if ($Params) {
+        # Sorted: hashtable key order varies between processes, and the
+        # URL is the ETag cache key.
+        $queryString = ($Params.Keys | Sort-Object | ForEach-Object { "$_=$($Params[$_])" }) -join '&'
+        $requestUri += "?$queryString"
+    }
+
     $requestParams = @{
         Method      = $Method
-        Uri         = "$ApiBase$Uri"
+        Uri         = $requestUri
         Headers     = $Headers
         ContentType = 'application/json'
         TimeoutSec  = 30
+        WebSession  = $script:CfWebSession
     }
 
     if ($Body) { $requestParams['Body'] = ($Body | ConvertTo-Json -Depth 10 -Compress) }
-    
-    # Append Query Params
-    if ($Params) {
-        $queryString = ($Params.Keys | ForEach-Object { "$_=$($Params[$_])" }) -join '&'
-        $requestParams['Uri'] += "?$queryString"
-    }
+    if ($script:CfHttpVersion) { $requestParams['HttpVersion'] = $script:CfHttpVersion }
+
+    # HTTP 429 and transient failures (5xx, timeouts) are retried with
+    # jittered exponential backoff, honouring Retry-After (the library's
+    # Get-CfRetryDelay), instead of failing the whole run on one blip.
+    # Transient failures are retried for idempotent methods only: a POST
+    # that timed out may still have created its record.
+    $maxAttempts = 5
+    $idempotent = ($Method -in @('GET', 'PUT', 'DELETE'))
 
     # In PowerShell 7+, we can use Invoke-WebRequest -SkipHttpErrorCheck to reliably capture
     # HTTP status codes and the raw JSON error body from Cloudflare. This makes diagnostics
     # (like DMARC Management enablement) much clearer.
-    $canSkipHttpErrors = $false
-    try {
-        $canSkipHttpErrors = (Get-Command Invoke-WebRequest -ErrorAction Stop).Parameters.ContainsKey('SkipHttpErrorCheck')
-    }
-    catch {
-        $canSkipHttpErrors = $false
-    }
-
-    if ($canSkipHttpErrors) {
-        $iwrParams = @{
-            Method             = $Method
-            Uri                = "$ApiBase$Uri"
-            Headers            = $Headers
-            ContentType        = 'application/json'
-            TimeoutSec         = 30
-            SkipHttpErrorCheck = $true
+    if ($script:CanSkipHttpErrors) {
+        $iwrParams = $requestParams.Clone()
+        $iwrParams['SkipHttpErrorCheck'] = $true
+
+        $cached = $null
+        if ($Conditional -and $Method -eq 'GET') {
+            $cached = Read-CfHttpCache -Token $AuthToken -Uri $iwrParams['Uri']
+            if ($cached) { $iwrParams['Headers'] = $Headers + @{ 'If-None-Match' = [string]$cached.ETag } }
         }
-        if ($Body) { $iwrParams['Body'] = ($Body | ConvertTo-Json -Depth 10 -Compress) }
 
-        # Append Query Params
-        if ($Params) {
-            $queryString = ($Params.Keys | ForEach-Object { "$_=$($Params[$_])" }) -join '&'
-            $iwrParams['Uri'] += "?$queryString"
+        for ($attempt = 1; ; $attempt++) {
+            try {
+                $resp = Invoke-WebRequest @iwrParams
+            }
+            catch {
+                # With SkipHttpErrorCheck only transport failures land here;
+                # of those, only a timeout is worth another try.
+                if (-not $idempotent -or $attempt -ge $maxAttempts -or $_.Exception.Message -notmatch '(?i)timed?\s?out|timeout') { throw }
+                $delay = Get-CfRetryDelay -Attempt $attempt
+                Write-Warning "$Method $Uri timed out; retrying in ${delay}s (attempt $($attempt + 1) of $maxAttempts)..."
+                Start-Sleep -Milliseconds ([int]($delay * 1000))
+                continue
+            }
+            $statusCode = [int]$resp.StatusCode
+            if (($statusCode -eq 429 -or ($idempotent -and $statusCode -ge 500)) -and $attempt -lt $maxAttempts) {
+                $retryAfter = if ($statusCode -eq 429) { Get-CfRetryAfterSeconds -Response $resp.BaseResponse }
+                $delay = Get-CfRetryDelay -Attempt $attempt -RetryAfter $retryAfter
+                Write-Warning "$Method $Uri returned HTTP $statusCode; retrying in ${delay}s (attempt $($attempt + 1) of $maxAttempts)..."
+                Start-Sleep -Milliseconds ([int]($delay * 1000))
+                continue
+            }
+            break
+        }
+        # 304: the listing is unchanged since it was cached -- no body came back.
+        if ($statusCode -eq 304 -and $cached) {
+            return $cached.Body
         }
-
-        $resp = Invoke-WebRequest @iwrParams
-        $statusCode = [int]$resp.StatusCode
         $raw = $resp.Content
 
         $parsed = $null
@@ -341,83 +422,130 @@ function Invoke-CfApi {
             throw $ex
         }
 
+        if ($Conditional -and $Method -eq 'GET' -and $resp.Headers -and $resp.Headers['ETag'] -and -not [string]::IsNullOrWhiteSpace($raw)) {
+            Write-CfHttpCache -Token $AuthToken -Uri $iwrParams['Uri'] -ETag (@($resp.Headers['ETag'])[0]) -Body $raw
+        }
+
         return $parsed
     }
 
     # Fallback path for environments without SkipHttpErrorCheck.
-    try {
-        $response = Invoke-RestMethod @requestParams
-        if (-not $response.success) {
-            $err = $response.errors | Select-Object -ExpandProperty message -ErrorAction SilentlyContinue
-            throw "API Error: $err"
+    for ($attempt = 1; ; $attempt++) {
+        try {
+            $response = Invoke-RestMethod @requestParams
+            if (-not $response.success) {
+                $err = $response.errors | Select-Object -ExpandProperty message -ErrorAction SilentlyContinue
+                $ex = [System.Exception]::new("API Error: $err")
+                $ex.Data['CfEnvelopeRefused'] = $true
+                throw $ex
+            }
+            return $response
         }
-        return $response
-    }
-    catch {
-        Write-Error "Request Failed: $($_.Exception.Message)"
-        if ($_.Exception.Response) {
+        catch {
+            if ($_.Exception.Data['CfEnvelopeRefused']) { throw }
+            $statusCode = $null
+            try { if ($_.Exception.Response) { $statusCode = [int]$_.Exception.Response.StatusCode } } catch { $statusCode = $null }
+            $retryable = ($statusCode -eq 429) -or ($idempotent -and ($statusCode -ge 500 -or $_.Exception.Message -match '(?i)timed?\s?out|timeout'))
+            if ($retryable -and $attempt -lt $maxAttempts) {
+                $retryAfter = if ($statusCode -eq 429) { Get-CfRetryAfterSeconds -Response $_.Exception.Response }
+                $delay = Get-CfRetryDelay -Attempt $attempt -RetryAfter $retryAfter
+                Write-Warning "$Method $Uri failed ($($_.Exception.Message)); retrying in ${delay}s (attempt $($attempt + 1) of $maxAttempts)..."
+                Start-Sleep -Milliseconds ([int]($delay * 1000))
+                continue
+            }
+
+            # Thrown rather than Write-Error'd: under ErrorActionPreference
+            # Stop a Write-Error replaces the exception, and with it the
+            # status callers need (Test-CfRequestRefused).
+            $message = "Request Failed: $($_.Exception.Message)"
             $body = $null
+            if ($_.Exception.Response) {
 
-            # PowerShell 7 often surfaces a System.Net.Http.HttpResponseMessage
-            # while Windows PowerShell 5.1 surfaces a WebResponse with a stream.
-            if ($_.Exception.Response -is [System.Net.Http.HttpResponseMessage]) {
-                try {
-                    $body = $_.Exception.Response.Content.ReadAsStringAsync().GetAwaiter().GetResult()
-                }
-                catch {
-                    $body = $null
+                # PowerShell 7 often surfaces a System.Net.Http.HttpResponseMessage
+                # while Windows PowerShell 5.1 surfaces a WebResponse with a stream.
+                if ($_.Exception.Response -is [System.Net.Http.HttpResponseMessage]) {
+                    try {
+                        $body = $_.Exception.Response.Content.ReadAsStringAsync().GetAwaiter().GetResult()
+                    }
+                    catch {
+                        $body = $null
+                    }
                 }
-            }
-            else {
-                try {
-                    $stream = $_.Exception.Response.GetResponseStream()
-                    if ($stream) {
-                        $reader = [System.IO.StreamReader]::new($stream)
-                        $body = $reader.ReadToEnd()
+                else {
+                    try {
+                        $stream = $_.Exception.Response.GetResponseStream()
+                        if ($stream) {
+                            $reader = [System.IO.StreamReader]::new($stream)
+                            $body = $reader.ReadToEnd()
+                        }
+                    }
+                    catch {
+                        $body = $null
                     }
                 }
-                catch {
-                    $body = $null
+                if (-not [string]::IsNullOrWhiteSpace([string]$body)) {
+                    $message += " | API Error Body: $body"
                 }
             }
-            try {
-                # Preserve the body for downstream callers (e.g., diagnostics)
-                # Note: the response stream can only be read once.
-                $_.Exception.Data['CfErrorBody'] = $body
-            }
-            catch {
-                # best-effort
-            }
-
-            if (-not [string]::IsNullOrWhiteSpace([string]$body)) {
-                Write-Error "API Error Body: $body"
-            }
+            $ex = [System.Exception]::new($message, $_.Exception)
+            # Preserve the body for downstream callers (e.g., diagnostics).
+            # Note: the response stream can only be read once.
+            $ex.Data['CfErrorBody'] = $body
+            $ex.Data['CfStatusCode'] = $statusCode
+            throw $ex
         }
-        throw
     }
 }
 
 function Get-ZoneId {
     param([string]$ZoneName)
+    $known = $script:ZoneIdByName[$ZoneName.ToLowerInvariant()]
+    if ($known) { return $known }
+    # Zone ids never change while the zone exists; the library's on-disk cache
+    # (24h, per token) spares a repeat run the lookup.
+    if (-not $RefreshZoneCache) {
+        $cached = Read-CfZoneCache -Domain $ZoneName -Token $AuthToken
+        if ($cached) { return $cached.ZoneId }
+    }
     Write-Verbose "Looking up Zone ID for $ZoneName..."
-    $resp = Invoke-CfApi -Method 'GET' -Uri '/zones' -Params @{ name = $ZoneName }
+    try {
+        $resp = Invoke-CfApi -Method 'GET' -Uri '/zones' -Params @{ name = $ZoneName; per_page = 1 }
+    }
+    catch {
+        # Serve stale: the id of an existing zone does not change, so an
+        # expired entry beats failing the run while the API is unreachable.
+        $stale = Read-CfZoneCache -Domain $ZoneName -Token $AuthToken -AllowExpired
+        if (-not $stale) { throw }
+        Write-Warning "Zone lookup for $ZoneName failed ($($_.Exception.Message)); using the cached zone id."
+        return $stale.ZoneId
+    }
     $zones = $resp.result
     if ($zones.Count -eq 0) { throw "Zone '$ZoneName' not found." }
+    Write-CfZoneCache -Domain $ZoneName -Token $AuthToken -ZoneId $zones[0].id -ZoneName $zones[0].name
     return $zones[0].id
 }
 
 function Get-AllDnsRecords {
     param(
         [Parameter(Mandatory = $true)]
-        [string]$ZoneId
+        [string]$ZoneId,
+
+        # Optional server-side filter: only the records at this exact name.
+        [string]$Name,
+
+        # Revalidate against the ETag cache. Read-only callers only (-Audit,
+        # -ExportAll); a listing that decides a write goes to Cloudflare.
+        [switch]$Conditional
     )
 
     $page = 1
-    $perPage = 100
+    $perPage = $script:CfDnsRecordsPerPage
     $records = @()
 
     while ($true) {
-        $resp = Invoke-CfApi -Method 'GET' -Uri "/zones/$ZoneId/dns_records" -Params @{ per_page = $perPage; page = $page }
+        $params = @{ per_page = $perPage; page = $page }
+        if ($Name) { $params.name = $Name }
+        $resp = Invoke-CfApi -Method 'GET' -Uri "/zones/$ZoneId/dns_records" -Params $params -Conditional:$Conditional
         if ($resp.result) { $records += $resp.result }
 
         $totalPages = $null
@@ -434,6 +562,41 @@ function Get-AllDnsRecords {
     return $records
 }
 
+function New-DnsRecordIndex {
+    # Groups a zone's records under "TYPE|name" so audit and enforce can fetch
+    # the records at one name with a single lookup, instead of every check and
+    # every standard re-scanning the whole inventory with Where-Object.
+    # PowerShell hashtables compare keys case-insensitively, which matches the
+    # -eq comparisons the scans used.
+    param(
+        [AllowNull()][AllowEmptyCollection()]$Records
+    )
+
+    $index = @{}
+    foreach ($rec in @($Records | Where-Object { $null -ne $_ })) {
+        $key = "$($rec.type)|$($rec.name)"
+        if (-not $index.ContainsKey($key)) {
+            $index[$key] = [System.Collections.Generic.List[object]]::new()
+        }
+        $index[$key].Add($rec)
+    }
+    return $index
+}
+
+function Get-IndexedDnsRecords {
+    # The records of one type at one name, unrolled like the Where-Object scan
+    # it replaces: nothing when absent, the record itself when there is one.
+    param(
+        # A new zone has no records, so an empty index is legitimate.
+        [Parameter(Mandatory = $true)][AllowEmptyCollection()][hashtable]$Index,
+        [Parameter(Mandatory = $true)][string]$Type,
+        [Parameter(Mandatory = $true)][string]$Name
+    )
+
+    $key = "$Type|$Name"
+    if ($Index.ContainsKey($key)) { return $Index[$key].ToArray() }
+}
+
 function Normalize-TxtContent {
     # The LOGICAL value of a TXT record, independent of how DNS chopped it up.
     #
@@ -586,7 +749,10 @@ function Test-DnsRecordShouldRemove {
 }
 
 function Get-DnsRecordPayload {
-    # The request body for a create or update on the SET path.
+    # The request body for a create or update on the SET path and the
+    # GitHubPagesOnly path. The enforce loop still builds its own: SRV goes
+    # out as 'data' rather than 'content', and it sends 'proxied' only when
+    # the standard states one.
     #
     # Named for the same reason as Test-DnsContentMatch: built inline, the TXT
     # quoting below was reachable by no test in the repo -- reverting it to raw
@@ -623,6 +789,92 @@ function Get-DnsRecordPayload {
     return $payload
 }
 
+function Invoke-DnsRecordCreateBatch {
+    # Creates the records the enforce loop found missing.
+    #
+    # Two or more go out as ONE POST /zones/{id}/dns_records/batch instead of a
+    # round-trip each. Cloudflare applies a batch as a single transaction, so a
+    # batch it REFUSED (4xx: no batch endpoint for this token or plan, a bad
+    # record) has created nothing and replaying it record by record is safe;
+    # the replay reports each failure the way the loop always did. A timeout,
+    # dropped connection or 5xx is not a refusal -- the batch may well have
+    # committed -- so that stops the run instead: replaying would create the
+    # records twice, while a re-run re-reads the zone and creates only what is
+    # still missing.
+    param(
+        # Each item: @{ Label = 'TYPE name'; Payload = <create body> }
+        [Parameter(Mandatory = $true)][object[]]$Creates,
+        [Parameter(Mandatory = $true)][string]$ZoneId
+    )
+
+    if ($Creates.Count -gt 1) {
+        try {
+            $posts = @($Creates | ForEach-Object { $_.Payload })
+            $null = Invoke-CfApi -Method 'POST' -Uri "/zones/$ZoneId/dns_records/batch" -Body @{ posts = $posts }
+            Write-Host (@($Creates | ForEach-Object { "CREATED $($_.Label)" }) -join [Environment]::NewLine) -ForegroundColor Green
+            return
+        }
+        catch {
+            if (-not (Test-CfRequestRefused -ErrorRecord $_)) {
+                throw "Batch create of $($Creates.Count) records did not complete ($($_.Exception.Message)); Cloudflare may already have applied it. Re-run to converge: the enforce pass only creates what is still missing."
+            }
+            Write-Warning "Batch create of $($Creates.Count) records was refused ($($_.Exception.Message)); creating them individually."
+        }
+    }
+
+    # The replay: creates are independent, so on PowerShell 7 they go out
+    # concurrently (4 at a time, inside Cloudflare's rate limit). Runspaces
+    # cannot see this script's Invoke-CfApi or $Headers, so they use the shared
+    # library's. Results are reported afterwards in the original order.
+    if ($PSVersionTable.PSVersion.Major -ge 7 -and $Creates.Count -gt 1) {
+        $libPath = $script:CfLibPath
+        $token = $AuthToken
+        $createPath = "/zones/$ZoneId/dns_records"
+        $work = for ($i = 0; $i -lt $Creates.Count; $i++) { [pscustomobject]@{ Index = $i; Payload = $Creates[$i].Payload } }
+        $outcomes = $work | ForEach-Object -ThrottleLimit 4 -Parallel {
+            $lib = $using:libPath
+            . $lib
+            $item = $_
+            try {
+                $null = Invoke-CfApi -Method 'POST' -Token $using:token -Path $using:createPath -Body $item.Payload
+                [pscustomobject]@{ Index = $item.Index; Error = $null }
+            }
+            catch {
+                [pscustomobject]@{ Index = $item.Index; Error = "$_" }
+            }
+        }
+        # Successes go out as one block rather than a line per record, and
+        # before any failure is reported, so a failure cannot hide them. The
+        # failures then go out as ONE error: under ErrorActionPreference Stop
+        # the first Write-Error ends the script, so one per record would
+        # report only the first.
+        $created = [System.Collections.Generic.List[string]]::new()
+        $failed = [System.Collections.Generic.List[string]]::new()
+        foreach ($o in @($outcomes | Sort-Object Index)) {
+            $label = $Creates[$o.Index].Label
+            if ($o.Error) {
+                $failed.Add("Failed to create $label ($($o.Error))")
+            }
+            else {
+                $created.Add("CREATED $label")
+            }
+        }
+        if ($created.Count -gt 0) { Write-Host ($created -join [Environment]::NewLine) -ForegroundColor Green }
+        if ($failed.Count -gt 0) { Write-Error ($failed -join [Environment]::NewLine) }
+        return
+    }
+
+    foreach ($c in $Creates) {
+        try {
+            $null = Invoke-CfApi -Method 'POST' -Uri "/zones/$ZoneId/dns_records" -Body $c.Payload
+            Write-Host "CREATED $($c.Label)" -ForegroundColor Green
+        }
+        catch {
+            Write-Error "Failed to create $($c.Label)"
+        }
+    }
+}
+
 function Enable-DmarcManagement {
     param(
         [Parameter(Mandatory = $true)][string]$ZoneId,
@@ -1295,6 +1547,10 @@ function Resolve-MultiValueRecordMatch {
     return [pscustomobject]@{ Found = $null; UpdateCandidate = $null }
 }
 
+# Record types that carry a proxied flag. Built once; the enforce loop asks
+# for every standard, on both the update and the create path.
+$script:ProxiableTypes = [System.Collections.Generic.HashSet[string]]::new(
+    [string[]]@('A', 'AAAA', 'CNAME'), [System.StringComparer]::OrdinalIgnoreCase)
 
 # --- Main Logic ---
 
@@ -1308,7 +1564,7 @@ try {
     # the Audit path fetches) to stdout AND a CSV artifact. Unlike -List, this
     # is not name-filtered, so it returns every record in the zone.
     if ($ExportAll) {
-        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
+        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId -Conditional
         $projected = $allRecords |
             Select-Object id, type, name, content, proxied, ttl, priority |
             Sort-Object type, name
@@ -1329,13 +1585,17 @@ try {
         else { $RecordName = "$Name.$Zone" }
     }
 
-    # 3. Search for existing records
-    $queryParams = @{
-        name = $RecordName
-    }
-    if ($Type) { $queryParams['type'] = $Type }
+    # 3. Search for existing records. -Audit and -EnforceStandard take no
+    # -Name and list the zone themselves, so they skip this lookup.
+    $existing = @()
+    if (-not ($Audit -or $EnforceStandard)) {
+        $queryParams = @{
+            name = $RecordName
+        }
+        if ($Type) { $queryParams['type'] = $Type }
 
-    $existing = (Invoke-CfApi -Method 'GET' -Uri "/zones/$ZoneId/dns_records" -Params $queryParams).result
+        $existing = (Invoke-CfApi -Method 'GET' -Uri "/zones/$ZoneId/dns_records" -Params $queryParams).result
+    }
 
     # --- LIST Operation ---
     if ($List) {
@@ -1351,7 +1611,8 @@ try {
         Write-Host "Running Compliance Audit for Zone: $Zone" -ForegroundColor Cyan
         
         # Helper to find
-        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
+        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId -Conditional
+        $recordIndex = New-DnsRecordIndex -Records $allRecords
 
         # 0. CNAME Inventory (helps identify other required CNAMEs beyond WWW)
         $cnameRecords = $allRecords | Where-Object { $_.type -eq 'CNAME' } | Sort-Object name
@@ -1360,9 +1621,12 @@ try {
         }
         else {
             Write-Host "CNAME inventory:" -ForegroundColor DarkCyan
-            foreach ($rec in $cnameRecords) {
-                Write-Host (" - {0} -> {1} (proxied={2}, ttl={3})" -f $rec.name, $rec.content, $rec.proxied, $rec.ttl)
+            # One write for the whole list: a zone can hold hundreds of CNAMEs,
+            # and each Write-Host is a separate trip through the host.
+            $lines = foreach ($rec in $cnameRecords) {
+                " - {0} -> {1} (proxied={2}, ttl={3})" -f $rec.name, $rec.content, $rec.proxied, $rec.ttl
             }
+            Write-Host ($lines -join [Environment]::NewLine)
         }
 
         # Audit against the provider the domain is SUPPOSED to be on — explicit
@@ -1398,7 +1662,7 @@ try {
         $requiredCnames += @{ Name = "www.$Zone"; Content = (Get-GhPagesWwwTarget); Proxied = $githubPagesProxied }
 
         foreach ($req in $requiredCnames) {
-            $candidates = $allRecords | Where-Object { $_.type -eq 'CNAME' -and $_.name -eq $req.Name }
+            $candidates = Get-IndexedDnsRecords -Index $recordIndex -Type 'CNAME' -Name $req.Name
             $match = $candidates | Where-Object { $_.content -eq $req.Content -and $_.proxied -eq $req.Proxied }
 
             if ($match) {
@@ -1422,7 +1686,7 @@ try {
         }
 
         foreach ($req in $requiredSrvs) {
-            $candidates = $allRecords | Where-Object { $_.type -eq 'SRV' -and $_.name -eq $req.Name }
+            $candidates = Get-IndexedDnsRecords -Index $recordIndex -Type 'SRV' -Name $req.Name
             $match = $candidates | Where-Object {
                 $_.data -and
                 [int]$_.data.priority -eq [int]$req.Priority -and
@@ -1463,7 +1727,8 @@ try {
         # Note: Cloudflare's API/UI frequently normalizes TXT quoting. Treat normalized content as authoritative
         # to avoid false diffs and unnecessary rewrites.
         if ($auditMail) {
-            $spf = $allRecords | Where-Object { $_.type -eq 'TXT' -and $_.name -eq $Zone -and (Normalize-TxtContent -Value $_.content) -like "*$($mailProfile.SpfInclude)*" }
+            $spfPattern = "*$($mailProfile.SpfInclude)*"
+            $spf = Get-IndexedDnsRecords -Index $recordIndex -Type 'TXT' -Name $Zone | Where-Object { (Normalize-TxtContent -Value $_.content) -like $spfPattern }
             if ($spf) {
                 Write-Host "[OK] $($mailProfile.DisplayName) SPF Record found" -ForegroundColor Green
             }
@@ -1471,7 +1736,7 @@ try {
         }
 
         # 3. DMARC
-        $dmarc = $allRecords | Where-Object { $_.type -eq 'TXT' -and $_.name -like "_dmarc.$Zone" }
+        $dmarc = Get-IndexedDnsRecords -Index $recordIndex -Type 'TXT' -Name "_dmarc.$Zone"
         $dmarcValid = $dmarc | Where-Object { (Normalize-TxtContent -Value $_.content) -like 'v=DMARC1*' }
         if ($dmarcValid) {
             $normalizedDmarc = Normalize-TxtContent -Value ($dmarcValid | Select-Object -First 1).content
@@ -1500,8 +1765,11 @@ try {
         $ghV4Ips = @(Get-GhPagesIps)
         $ghV6Ips = @(Get-GhPagesIpv6s)
 
-        $aRecords = $allRecords | Where-Object { $_.type -eq 'A' -and $_.name -eq $Zone }
-        $missingV4 = $ghV4Ips | Where-Object { $_ -notin $aRecords.content }
+        # Membership against a set of what the apex actually has, built once,
+        # rather than re-scanning the apex records for every Pages IP.
+        $aRecords = Get-IndexedDnsRecords -Index $recordIndex -Type 'A' -Name $Zone
+        $apexV4 = [System.Collections.Generic.HashSet[string]]::new([string[]]@($aRecords | ForEach-Object { $_.content }), [System.StringComparer]::OrdinalIgnoreCase)
+        $missingV4 = @($ghV4Ips | Where-Object { -not $apexV4.Contains($_) })
         if ($missingV4.Count -eq 0 -and $aRecords.Count -ge 4) {
             Write-Host "[OK] GitHub Pages A Records found" -ForegroundColor Green
         }
@@ -1509,8 +1777,9 @@ try {
             Write-Warning "[MISSING/PARTIAL] GitHub Pages A Records. Missing: $($missingV4 -join ', ')"
         }
 
-        $aaaaRecords = $allRecords | Where-Object { $_.type -eq 'AAAA' -and $_.name -eq $Zone }
-        $missingV6 = $ghV6Ips | Where-Object { $_ -notin $aaaaRecords.content }
+        $aaaaRecords = Get-IndexedDnsRecords -Index $recordIndex -Type 'AAAA' -Name $Zone
+        $apexV6 = [System.Collections.Generic.HashSet[string]]::new([string[]]@($aaaaRecords | ForEach-Object { $_.content }), [System.StringComparer]::OrdinalIgnoreCase)
+        $missingV6 = @($ghV6Ips | Where-Object { -not $apexV6.Contains($_) })
         if ($missingV6.Count -eq 0 -and $aaaaRecords.Count -ge 4) {
             Write-Host "[OK] GitHub Pages AAAA Records found" -ForegroundColor Green
         }
@@ -1519,7 +1788,7 @@ try {
         }
 
         # 5. WWW CNAME
-        $www = $allRecords | Where-Object { $_.type -eq 'CNAME' -and $_.name -eq "www.$Zone" }
+        $www = Get-IndexedDnsRecords -Index $recordIndex -Type 'CNAME' -Name "www.$Zone"
         if ($www) { Write-Host "[OK] WWW CNAME found ($($www.content))" -ForegroundColor Green }
         else { Write-Warning "[MISSING] WWW CNAME record" }
 
@@ -1530,9 +1799,6 @@ try {
     if ($EnforceStandard) {
         Write-Host "Enforcing FFC Standard Configuration for Zone: $Zone" -ForegroundColor Cyan
 
-        # IMPORTANT: Enforce needs a full record inventory. Without this, it will treat everything as missing.
-        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
-
         if ($GitHubPagesOnly) {
             Write-Host "GitHubPagesOnly enabled: will only update apex A/AAAA + www CNAME. MX/TXT/SRV/etc will not be modified." -ForegroundColor Yellow
 
@@ -1545,6 +1811,11 @@ try {
             $pagesProxied = [bool]$ProxyGitHubPages
             $pagesTtl = 1
 
+            # Only two names are touched, so ask Cloudflare for just those
+            # instead of listing the whole zone (and relisting it after deletes).
+            $apexRecords = @(Get-AllDnsRecords -ZoneId $ZoneId -Name $apexFqdn)
+            $wwwRecords = @(Get-AllDnsRecords -ZoneId $ZoneId -Name $wwwFqdn)
+
             function Remove-RecordById {
                 param(
                     [Parameter(Mandatory = $true)][string]$RecordId,
@@ -1570,7 +1841,7 @@ try {
                     [Parameter(Mandatory = $true)][int]$DesiredTtl
                 )
 
-                $existingSet = @($allRecords | Where-Object { $_.type -eq $Type -and $_.name -eq $Fqdn })
+                $existingSet = @($apexRecords | Where-Object { $_.type -eq $Type -and $_.name -eq $Fqdn })
 
                 # 1) Remove any records that are not part of the desired set
                 foreach ($rec in $existingSet) {
@@ -1579,17 +1850,17 @@ try {
                     }
                 }
 
-                # Refresh view if we did deletes (Cloudflare API state changed)
+                # What is left is exactly what we kept; a failed delete has
+                # already stopped the run, so no need to ask Cloudflare again.
                 if (-not $DryRun) {
-                    $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
-                    $existingSet = @($allRecords | Where-Object { $_.type -eq $Type -and $_.name -eq $Fqdn })
+                    $existingSet = @($existingSet | Where-Object { $DesiredContents -contains $_.content })
                 }
 
                 # 2) Ensure each desired content exists, and matches proxied/ttl
                 foreach ($content in $DesiredContents) {
                     $match = $existingSet | Where-Object { $_.content -eq $content } | Select-Object -First 1
                     if (-not $match) {
-                        $payload = @{ type = $Type; name = $Fqdn; content = $content; ttl = $DesiredTtl; proxied = $DesiredProxied }
+                        $payload = Get-DnsRecordPayload -Type $Type -RecordName $Fqdn -Content $content -Ttl $DesiredTtl -Proxied $DesiredProxied
                         if ($DryRun) {
                             Write-Host "[DRY-RUN] Would CREATE new record: $Type $Fqdn -> $content (Proxied: $DesiredProxied)" -ForegroundColor Yellow
                         }
@@ -1606,7 +1877,7 @@ try {
                     if ([int]$match.ttl -ne [int]$DesiredTtl) { $needsUpdate = $true }
 
                     if ($needsUpdate) {
-                        $payload = @{ type = $Type; name = $Fqdn; content = $content; ttl = $DesiredTtl; proxied = $DesiredProxied }
+                        $payload = Get-DnsRecordPayload -Type $Type -RecordName $Fqdn -Content $content -Ttl $DesiredTtl -Proxied $DesiredProxied
                         if ($DryRun) {
                             Write-Host "[DRY-RUN] Would UPDATE record $($match.id): $Type $Fqdn -> $content (Proxied: $DesiredProxied)" -ForegroundColor Yellow
                         }
@@ -1631,19 +1902,16 @@ try {
                 )
 
                 # Remove any A/AAAA records at www (avoid conflicts)
-                $wwwConflicts = @($allRecords | Where-Object { $_.name -eq $Fqdn -and $_.type -in @('A', 'AAAA') })
+                $wwwConflicts = @($wwwRecords | Where-Object { $_.name -eq $Fqdn -and $_.type -in @('A', 'AAAA') })
                 foreach ($rec in $wwwConflicts) {
                     Remove-RecordById -RecordId $rec.id -Type $rec.type -Name $rec.name -Content $rec.content
                 }
 
-                if (-not $DryRun) {
-                    $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
-                }
-
-                $existingCnames = @($allRecords | Where-Object { $_.name -eq $Fqdn -and $_.type -eq 'CNAME' })
+                # Deleting A/AAAA leaves any CNAMEs at the name untouched.
+                $existingCnames = @($wwwRecords | Where-Object { $_.name -eq $Fqdn -and $_.type -eq 'CNAME' })
 
                 if ($existingCnames.Count -eq 0) {
-                    $payload = @{ type = 'CNAME'; name = $Fqdn; content = $Target; ttl = $DesiredTtl; proxied = $DesiredProxied }
+                    $payload = Get-DnsRecordPayload -Type 'CNAME' -RecordName $Fqdn -Content $Target -Ttl $DesiredTtl -Proxied $DesiredProxied
                     if ($DryRun) {
                         Write-Host "[DRY-RUN] Would CREATE new record: CNAME $Fqdn -> $Target (Proxied: $DesiredProxied)" -ForegroundColor Yellow
                     }
@@ -1666,7 +1934,7 @@ try {
                         continue
                     }
 
-                    $payload = @{ type = 'CNAME'; name = $Fqdn; content = $Target; ttl = $DesiredTtl; proxied = $DesiredProxied }
+                    $payload = Get-DnsRecordPayload -Type 'CNAME' -RecordName $Fqdn -Content $Target -Ttl $DesiredTtl -Proxied $DesiredProxied
                     if ($DryRun) {
                         Write-Host "[DRY-RUN] Would UPDATE record $($rec.id): CNAME $Fqdn -> $Target (Proxied: $DesiredProxied)" -ForegroundColor Yellow
                     }
@@ -1685,6 +1953,10 @@ try {
             return
         }
 
+        # IMPORTANT: Enforce needs a full record inventory. Without this, it will treat everything as missing.
+        $allRecords = Get-AllDnsRecords -ZoneId $ZoneId
+        $recordIndex = New-DnsRecordIndex -Records $allRecords
+
         # DMARC Management API probing is intentionally disabled by default (too noisy and not routable).
         # Set FFC_CF_DMARCMGMT_DEBUG=1 to run the probe/attempts.
         if ($env:FFC_CF_DMARCMGMT_DEBUG -eq '1') {
@@ -1775,27 +2047,27 @@ try {
         # Pages records below are provider-agnostic and apply either way.
         # DMARC is provider-agnostic and applies to every zone; the mail
         # records below are added only for a domain that opted in.
-        $standards = @(
-            @{ Type = 'TXT'; Name = '_dmarc'; Content = 'v=DMARC1; p=none'; EnsureInternalRua = $true; PreserveCloudflareRua = $true; InternalRua = 'mailto:dmarc-rua@freeforcharity.org' }
-        )
+        # A List rather than `@() +=`, which copies the whole array on every add.
+        $standards = [System.Collections.Generic.List[hashtable]]::new()
+        $standards.Add(@{ Type = 'TXT'; Name = '_dmarc'; Content = 'v=DMARC1; p=none'; EnsureInternalRua = $true; PreserveCloudflareRua = $true; InternalRua = 'mailto:dmarc-rua@freeforcharity.org' })
 
         if ($manageMail) {
             # SPF: rewrite the provider include in place. MatchContains finds an
             # already-correct record; SpfCutover tells the TXT branch to edit an
             # existing v=spf1 rather than add a second one (two = permerror).
-            $standards += @{ Type = 'TXT'; Name = '@'; Content = $mailProfile.SpfContent; MatchContains = $mailProfile.SpfInclude; SpfCutover = $true; SpfRemoveIncludes = @($foreignProfile.SpfInclude) }
+            $standards.Add(@{ Type = 'TXT'; Name = '@'; Content = $mailProfile.SpfContent; MatchContains = $mailProfile.SpfInclude; SpfCutover = $true; SpfRemoveIncludes = @($foreignProfile.SpfInclude) })
 
             # MX first, then any provider service records (M365 has CNAMEs and
             # Teams SRVs; Google has none). Created BEFORE the foreign provider's
             # records are removed, so the zone is never left without an MX.
             foreach ($mx in $mailProfile.MxRecords) {
-                $standards += @{ Type = 'MX'; Name = '@'; Content = $mx.Content; Priority = $mx.Priority; MatchContent = $mailProfile.MxMatch }
+                $standards.Add(@{ Type = 'MX'; Name = '@'; Content = $mx.Content; Priority = $mx.Priority; MatchContent = $mailProfile.MxMatch })
             }
             foreach ($cname in $mailProfile.Cnames) {
-                $standards += @{ Type = 'CNAME'; Name = $cname.Name; Content = $cname.Content; Proxied = $false }
+                $standards.Add(@{ Type = 'CNAME'; Name = $cname.Name; Content = $cname.Content; Proxied = $false })
             }
             foreach ($srv in $mailProfile.Srvs) {
-                $standards += @{ Type = 'SRV'; Name = $srv.Name; Data = $srv.Data }
+                $standards.Add(@{ Type = 'SRV'; Name = $srv.Name; Data = $srv.Data })
             }
         }
 
@@ -1804,13 +2076,14 @@ try {
         # same order the literals used to be (A x4, AAAA x4, www) so the
         # enforcement output is unchanged.
         foreach ($ghIp in @(Get-GhPagesIps)) {
-            $standards += @{ Type = 'A'; Name = '@'; Content = $ghIp; Proxied = $githubPagesProxied }
+            $standards.Add(@{ Type = 'A'; Name = '@'; Content = $ghIp; Proxied = $githubPagesProxied })
         }
         foreach ($ghIp6 in @(Get-GhPagesIpv6s)) {
-            $standards += @{ Type = 'AAAA'; Name = '@'; Content = $ghIp6; Proxied = $githubPagesProxied }
+            $standards.Add(@{ Type = 'AAAA'; Name = '@'; Content = $ghIp6; Proxied = $githubPagesProxied })
         }
-        $standards += @{ Type = 'CNAME'; Name = 'www'; Content = $wwwTarget; Proxied = $githubPagesProxied }
+        $standards.Add(@{ Type = 'CNAME'; Name = 'www'; Content = $wwwTarget; Proxied = $githubPagesProxied })
 
+        $pendingCreates = [System.Collections.Generic.List[object]]::new()
         foreach ($std in $standards) {
             $recName = if ($std.Name -eq '@') { $Zone } else { "$($std.Name).$Zone" }
             
@@ -1831,11 +2104,11 @@ try {
             $desiredData = $null
             if ($std.Type -eq 'SRV' -and $std.ContainsKey('Data')) { $desiredData = $std.Data }
             $desiredProxied = $null
-            if ($std.Type -in @('A', 'AAAA', 'CNAME')) {
+            if ($script:ProxiableTypes.Contains($std.Type)) {
                 $desiredProxied = $true
                 if ($std.ContainsKey('Proxied')) { $desiredProxied = [bool]$std.Proxied }
             }
-            $candidates = $allRecords | Where-Object { $_.type -eq $std.Type -and $_.name -eq $recName }
+            $candidates = Get-IndexedDnsRecords -Index $recordIndex -Type $std.Type -Name $recName
 
             $foundRecord = $null
             $updateCandidate = $null
@@ -1961,10 +2234,13 @@ try {
                     if ($m.UpdateCandidate) { $updateCandidate = $m.UpdateCandidate }
                 }
                 'CNAME' {
-                    $foundRecord = $candidates | Where-Object { $_.content -eq $stdContent -and ($null -eq $desiredProxied -or $_.proxied -eq $desiredProxied) }
+                    # One pass for the content match; the proxy check and the
+                    # update preference both work from that subset.
+                    $sameContent = @($candidates | Where-Object { $_.content -eq $stdContent })
+                    $foundRecord = $sameContent | Where-Object { $null -eq $desiredProxied -or $_.proxied -eq $desiredProxied }
                     if (-not $foundRecord -and $candidates) {
                         # Prefer updating existing CNAME rather than creating a second one.
-                        $updateCandidate = ($candidates | Where-Object { $_.content -eq $stdContent } | Select-Object -First 1)
+                        $updateCandidate = $sameContent | Select-Object -First 1
                         if (-not $updateCandidate) { $updateCandidate = $candidates | Select-Object -First 1 }
                     }
                 }
@@ -2025,7 +2301,7 @@ try {
                         }
                     }
                     if ($std.Type -eq 'MX') { $updatePayload['priority'] = $std.Priority }
-                    if ($std.Type -in @('A', 'AAAA', 'CNAME') -and $null -ne $desiredProxied) { $updatePayload['proxied'] = $desiredProxied }
+                    if ($script:ProxiableTypes.Contains($std.Type) -and $null -ne $desiredProxied) { $updatePayload['proxied'] = $desiredProxied }
 
                     if (-not $DryRun) {
                         try {
@@ -2044,7 +2320,7 @@ try {
                         }
                         else {
                             $details = $stdContent
-                            if ($std.Type -in @('A', 'AAAA', 'CNAME') -and $null -ne $desiredProxied) {
+                            if ($script:ProxiableTypes.Contains($std.Type) -and $null -ne $desiredProxied) {
                                 $details = "$details (Proxied: $desiredProxied)"
                             }
                             Write-Host "[DRY-RUN] Would UPDATE record $($updateCandidate.id): $($std.Type) $recName -> $details" -ForegroundColor Yellow
@@ -2074,19 +2350,14 @@ try {
                 if ($std.Type -eq 'MX') { $newPayload['priority'] = $std.Priority }
                 # Proxied? Standard FFC: Pages A/CNAME = Proxied? Usually Yes for SSL. 
                 # M365 = No.
-                if ($std.Type -in @('A', 'AAAA', 'CNAME') -and $null -ne $desiredProxied) { $newPayload['proxied'] = $desiredProxied }
+                if ($script:ProxiableTypes.Contains($std.Type) -and $null -ne $desiredProxied) { $newPayload['proxied'] = $desiredProxied }
                 
                 # Name must be FQDN for the API
                 $newPayload['name'] = $recName
 
                 if (-not $DryRun) {
-                    try {
-                        $null = Invoke-CfApi -Method 'POST' -Uri "/zones/$ZoneId/dns_records" -Body $newPayload
-                        Write-Host "CREATED" -ForegroundColor Green
-                    }
-                    catch {
-                        Write-Error "Failed to create $($std.Type) $recName"
-                    }
+                    # Sent together after the loop (Invoke-DnsRecordCreateBatch).
+                    $pendingCreates.Add(@{ Label = "$($std.Type) $recName"; Payload = $newPayload })
                 }
                 else {
                     if ($std.Type -eq 'SRV') {
@@ -2096,7 +2367,7 @@ try {
                     }
                     else {
                         $details = $stdContent
-                        if ($std.Type -in @('A', 'AAAA', 'CNAME') -and $null -ne $desiredProxied) {
+                        if ($script:ProxiableTypes.Contains($std.Type) -and $null -ne $desiredProxied) {
                             $details = "$details (Proxied: $desiredProxied)"
                         }
                         Write-Host "[DRY-RUN] Would CREATE new record: $($std.Type) $recName -> $details" -ForegroundColor Yellow
@@ -2105,6 +2376,12 @@ try {
             }
         }
 
+        # Flushed BEFORE the mail cutover below deletes anything, so the desired
+        # provider's MX exists by the time the foreign one is removed.
+        if ($pendingCreates.Count -gt 0) {
+            Invoke-DnsRecordCreateBatch -Creates $pendingCreates.ToArray() -ZoneId $ZoneId
+        }
+
         # --- Mail provider cutover: retire the OTHER provider's records ---
         #
         # Always runs: a domain is on exactly one provider, so the other's
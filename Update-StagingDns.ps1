@@ -6,7 +6,9 @@
 .PARAMETER NewIp
     New IPv4 address for the staging subdomain.
 .PARAMETER Token
-    Cloudflare API token. If omitted you will be securely prompted.
+    Cloudflare API token. If omitted, CLOUDFLARE_API_TOKEN (then _FFC, _CM) is
+    used; failing that you are securely prompted, or in a non-interactive
+    session the script stops with an error.
 .PARAMETER DryRun
     Show intended action without performing API write.
 .EXAMPLE
@@ -33,12 +35,21 @@ $SubDomain = 'staging'
 $Fqdn = "$SubDomain.$RootDomain"
 $ApiBase = 'https://api.cloudflare.com/client/v4'
 
+# One web session for the zone lookup, record lookup and write, so they share
+# a keep-alive connection to api.cloudflare.com (PowerShell 7.4+ reuses the
+# session's HttpClient; 5.1 pools through ServicePointManager).
+$CfSession = New-Object Microsoft.PowerShell.Commands.WebRequestSession
+
 function Get-PlainToken {
     param([string]$Provided)
     if ($Provided) { return $Provided.Trim() }
     if ($env:CLOUDFLARE_API_TOKEN) { return $env:CLOUDFLARE_API_TOKEN.Trim() }
     if ($env:CLOUDFLARE_API_TOKEN_FFC) { return $env:CLOUDFLARE_API_TOKEN_FFC.Trim() }
     if ($env:CLOUDFLARE_API_TOKEN_CM) { return $env:CLOUDFLARE_API_TOKEN_CM.Trim() }
+    # A pipeline has nobody to answer the prompt: fail now instead of waiting forever.
+    if ([Console]::IsInputRedirected -or -not [Environment]::UserInteractive) {
+        throw 'Cloudflare API token is required: pass -Token or set CLOUDFLARE_API_TOKEN.'
+    }
     $secure = Read-Host 'Enter Cloudflare API Token' -AsSecureString
     $bstr = [Runtime.InteropServices.Marshal]::SecureStringToBSTR($secure)
     try { return [Runtime.InteropServices.Marshal]::PtrToStringBSTR($bstr) } finally { [Runtime.InteropServices.Marshal]::ZeroFreeBSTR($bstr) }
@@ -54,32 +65,29 @@ function Validate-IPv4 {
 }
 
 function Invoke-CfGet {
-    param([string]$Path, [string]$Token, [hashtable]$Query)
-    $headers = @{ Authorization = "Bearer $Token" }
+    param([string]$Path, [hashtable]$Query)
     $uri = "$ApiBase$Path"
     if ($Query -and $Query.Count -gt 0) {
         $queryString = ($Query.GetEnumerator() | ForEach-Object { [System.Uri]::EscapeDataString($_.Key) + '=' + [System.Uri]::EscapeDataString($_.Value) }) -join '&'
-        $uri = "$uri?$queryString"
+        $uri = "${uri}?$queryString"
     }
-    $resp = Invoke-RestMethod -Method Get -Uri $uri -Headers $headers -Body $null -ErrorAction Stop -Verbose:$false -TimeoutSec 30 -ContentType 'application/json'
+    $resp = Invoke-RestMethod -Method Get -Uri $uri -WebSession $CfSession -Body $null -ErrorAction Stop -Verbose:$false -TimeoutSec 30 -ContentType 'application/json'
     if (-not $resp.success) { throw "GET $Path failed: $(ConvertTo-Json $resp)" }
     return $resp
 }
 
 function Invoke-CfPatch {
-    param([string]$Path, [string]$Token, [hashtable]$Payload)
-    $headers = @{ Authorization = "Bearer $Token"; 'Content-Type' = 'application/json' }
+    param([string]$Path, [string]$Body)
     $uri = "$ApiBase$Path"
-    $resp = Invoke-RestMethod -Method Patch -Uri $uri -Headers $headers -Body ($Payload | ConvertTo-Json -Depth 5) -ErrorAction Stop -TimeoutSec 30 -Verbose:$false
+    $resp = Invoke-RestMethod -Method Patch -Uri $uri -WebSession $CfSession -Body $Body -ErrorAction Stop -TimeoutSec 30 -Verbose:$false -ContentType 'application/json'
     if (-not $resp.success) { throw "PATCH $Path failed: $(ConvertTo-Json $resp)" }
     return $resp
 }
 
 function Invoke-CfPost {
-    param([string]$Path, [string]$Token, [hashtable]$Payload)
-    $headers = @{ Authorization = "Bearer $Token"; 'Content-Type' = 'application/json' }
+    param([string]$Path, [string]$Body)
     $uri = "$ApiBase$Path"
-    $resp = Invoke-RestMethod -Method Post -Uri $uri -Headers $headers -Body ($Payload | ConvertTo-Json -Depth 5) -ErrorAction Stop -TimeoutSec 30 -Verbose:$false
+    $resp = Invoke-RestMethod -Method Post -Uri $uri -WebSession $CfSession -Body $Body -ErrorAction Stop -TimeoutSec 30 -Verbose:$false -ContentType 'application/json'
     if (-not $resp.success) { throw "POST $Path failed: $(ConvertTo-Json $resp)" }
     return $resp
 }
@@ -88,17 +96,20 @@ try {
     Validate-IPv4 -Ip $NewIp
     $plainToken = Get-PlainToken -Provided $Token
     if (-not $plainToken) { throw 'Cloudflare API token is required.' }
+    # Every call sends the same credentials: set them on the session once.
+    $CfSession.Headers['Authorization'] = "Bearer $plainToken"
 
     Write-Host "Retrieving zone id for $RootDomain..." -ForegroundColor Cyan
-    $zoneResp = Invoke-CfGet -Path '/zones' -Token $plainToken -Query @{ name = $RootDomain }
+    $zoneResp = Invoke-CfGet -Path '/zones' -Query @{ name = $RootDomain; per_page = 1 }
     $zoneId = $zoneResp.result[0].id
     if (-not $zoneId) { throw "Zone not found for $RootDomain" }
 
     Write-Host "Looking up existing DNS record for $Fqdn..." -ForegroundColor Cyan
-    $recordResp = Invoke-CfGet -Path "/zones/$zoneId/dns_records" -Token $plainToken -Query @{ type = 'A'; name = $Fqdn }
+    $recordResp = Invoke-CfGet -Path "/zones/$zoneId/dns_records" -Query @{ type = 'A'; name = $Fqdn }
     $existing = $recordResp.result
 
-    $payload = @{ type = 'A'; name = $Fqdn; content = $NewIp; ttl = 120; proxied = [bool]$Proxied }
+    # Same body for every write below, so serialize it once.
+    $payloadJson = @{ type = 'A'; name = $Fqdn; content = $NewIp; ttl = 120; proxied = [bool]$Proxied } | ConvertTo-Json -Depth 5 -Compress
 
     if ($existing.Count -gt 0) {
         Write-Host "Found $($existing.Count) existing A record(s) for $Fqdn" -ForegroundColor Cyan
@@ -114,7 +125,7 @@ try {
                 continue
             }
             Write-Host "  Updating id=$($rec.id)" -ForegroundColor Yellow
-            $upd = Invoke-CfPatch -Path "/zones/$zoneId/dns_records/$($rec.id)" -Token $plainToken -Payload $payload
+            $upd = Invoke-CfPatch -Path "/zones/$zoneId/dns_records/$($rec.id)" -Body $payloadJson
             Write-Host "    Updated ip: $($rec.content) -> $($upd.result.content) proxied: $($rec.proxied) -> $($upd.result.proxied)" -ForegroundColor Green
         }
     }
@@ -124,7 +135,7 @@ try {
         }
         else {
             Write-Host "Creating new A record for $Fqdn with $NewIp proxied=$([bool]$Proxied)" -ForegroundColor Yellow
-            $create = Invoke-CfPost -Path "/zones/$zoneId/dns_records" -Token $plainToken -Payload $payload
+            $create = Invoke-CfPost -Path "/zones/$zoneId/dns_records" -Body $payloadJson
             Write-Host "Created: $($create.result.name) -> $($create.result.content) proxied=$($create.result.proxied)" -ForegroundColor Green
         }
     }
@@ -64,6 +64,11 @@ $PreserveQueryString = -not $NoPreserveQueryString.IsPresent
 $ErrorActionPreference = 'Stop'
 $ApiBase = 'https://api.cloudflare.com/client/v4'
 
+# One web session for every call below (token probe, zone lookup, ruleset
+# read and write), so they reuse one keep-alive connection to
+# api.cloudflare.com instead of a TCP/TLS handshake each.
+$CfSession = New-Object Microsoft.PowerShell.Commands.WebRequestSession
+
 if ([string]::IsNullOrWhiteSpace($Description)) {
     $Description = "Repoint $SourceDomain to $TargetDomain"
 }
@@ -74,7 +79,7 @@ function Test-ZoneAccess {
     try {
         $h = @{ Authorization = "Bearer $CandidateToken"; 'Content-Type' = 'application/json' }
         $encoded = [uri]::EscapeDataString($ZoneName)
-        $resp = Invoke-RestMethod -Method Get -Uri "$ApiBase/zones?name=$encoded" -Headers $h -TimeoutSec 30
+        $resp = Invoke-RestMethod -Method Get -Uri "$ApiBase/zones?name=$encoded" -Headers $h -WebSession $CfSession -TimeoutSec 30
         return ($resp.success -and $resp.result -and $resp.result.Count -gt 0)
     }
     catch { return $false }
@@ -108,7 +113,7 @@ $Headers = @{ Authorization = "Bearer $AuthToken"; 'Content-Type' = 'application
 # --- Resolve zone ID ---
 Write-Host "Resolving zone ID for $SourceDomain..."
 $encoded = [uri]::EscapeDataString($SourceDomain)
-$zoneResp = Invoke-RestMethod -Method Get -Uri "$ApiBase/zones?name=$encoded" -Headers $Headers -TimeoutSec 30
+$zoneResp = Invoke-RestMethod -Method Get -Uri "$ApiBase/zones?name=$encoded" -Headers $Headers -WebSession $CfSession -TimeoutSec 30
 if (-not $zoneResp.success -or -not $zoneResp.result -or $zoneResp.result.Count -eq 0) {
     throw "Zone '$SourceDomain' not found or token lacks access."
 }
@@ -142,7 +147,7 @@ $phaseUri = "$ApiBase/zones/$zoneId/rulesets/phases/http_request_dynamic_redirec
 Write-Host "Fetching existing redirect ruleset..."
 $existingRuleset = $null
 try {
-    $existingResp = Invoke-RestMethod -Method Get -Uri $phaseUri -Headers $Headers -TimeoutSec 30
+    $existingResp = Invoke-RestMethod -Method Get -Uri $phaseUri -Headers $Headers -WebSession $CfSession -TimeoutSec 30
     if ($existingResp.success) { $existingRuleset = $existingResp.result }
 }
 catch {
@@ -200,7 +205,7 @@ Write-Host "Applying ruleset..." -ForegroundColor Green
 if ($existingRuleset) {
     # Update existing entrypoint with the new rules list
     $body = $payload | ConvertTo-Json -Depth 10 -Compress
-    $applyResp = Invoke-RestMethod -Method Put -Uri $phaseUri -Headers $Headers -Body $body -TimeoutSec 30
+    $applyResp = Invoke-RestMethod -Method Put -Uri $phaseUri -Headers $Headers -Body $body -WebSession $CfSession -TimeoutSec 30
 }
 else {
     # Create a new entrypoint ruleset for this phase. CF requires kind+phase+name on POST.
@@ -213,7 +218,7 @@ else {
     }
     $createUri = "$ApiBase/zones/$zoneId/rulesets"
     $body = $createPayload | ConvertTo-Json -Depth 10 -Compress
-    $applyResp = Invoke-RestMethod -Method Post -Uri $createUri -Headers $Headers -Body $body -TimeoutSec 30
+    $applyResp = Invoke-RestMethod -Method Post -Uri $createUri -Headers $Headers -Body $body -WebSession $CfSession -TimeoutSec 30
 }
 
 if (-not $applyResp.success) {
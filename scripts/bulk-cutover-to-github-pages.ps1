@@ -132,6 +132,8 @@ if ([string]::IsNullOrWhiteSpace($Domains)) {
 . (Join-Path $PSScriptRoot 'cloudflare-api-common.ps1')
 
 if (-not $GhPagesIps -or $GhPagesIps.Count -eq 0) { $GhPagesIps = @(Get-GhPagesIps) }
+# Membership test for the per-record classification below, built once.
+$ghPagesIpSet = [System.Collections.Generic.HashSet[string]]::new([string[]]$GhPagesIps)
 if ([string]::IsNullOrWhiteSpace($WwwTarget)) { $WwwTarget = Get-GhPagesWwwTarget }
 
 # ---------------------------------------------------------------------------
@@ -165,6 +167,10 @@ if ($SkipCname -and $SkipDns) {
 # ---------------------------------------------------------------------------
 # Helpers — GitHub REST
 # ---------------------------------------------------------------------------
+# Shared by every Invoke-Gh call: each domain costs several GitHub requests,
+# and one session keeps them on a single keep-alive connection.
+$script:GhWebSession = New-Object Microsoft.PowerShell.Commands.WebRequestSession
+
 function Invoke-Gh {
     param(
         [Parameter(Mandatory)][string]$Method,
@@ -177,7 +183,7 @@ function Invoke-Gh {
         Accept                 = 'application/vnd.github+json'
         'X-GitHub-Api-Version' = '2022-11-28'
     }
-    $params = @{ Method = $Method; Uri = $url; Headers = $headers; TimeoutSec = 30 }
+    $params = @{ Method = $Method; Uri = $url; Headers = $headers; TimeoutSec = 30; WebSession = $script:GhWebSession }
     if ($null -ne $Body) { $params.Body = ($Body | ConvertTo-Json -Depth 8 -Compress) }
     return Invoke-RestMethod @params
 }
@@ -248,7 +254,7 @@ Write-Host ''
 # ---------------------------------------------------------------------------
 # Per-domain processing
 # ---------------------------------------------------------------------------
-$results = @()
+$results = [System.Collections.Generic.List[object]]::new()
 
 foreach ($domain in $domainList) {
     Write-Host "--- [$domain] ---"
@@ -422,21 +428,32 @@ foreach ($domain in $domainList) {
             else {
                 Write-Host "[$domain]   Zone resolved via $($zone.Account) token (id $($zone.ZoneId))"
 
-                $apexRecords = @(Get-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token -Type A -Name $domain)
+                # One listing (a single page for any real zone) covers both the
+                # apex A set and www; split it locally rather than asking twice.
+                # The apex edits below never touch www, so the www half stays
+                # accurate for the CNAME upsert.
+                $wwwName = "www.$domain"
+                $zoneRecords = @(Get-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token)
+                $apexRecords = @($zoneRecords | Where-Object { $_.type -eq 'A' -and $_.name -eq $domain })
+                $wwwRecords = @($zoneRecords | Where-Object { $_.name -eq $wwwName })
                 Write-Host "[$domain]   Found $($apexRecords.Count) apex A record(s):"
                 foreach ($r in $apexRecords) {
                     Write-Host ("    - A {0} -> {1} (proxied={2}, ttl={3}, id={4})" -f $r.name, $r.content, $r.proxied, $r.ttl, $r.id)
                 }
 
                 # --- Idempotency check ---
-                $hostPapaRecords = @($apexRecords | Where-Object { $_.content -eq $HostPapaIp })
-                $ghPagesRecords = @($apexRecords | Where-Object { $GhPagesIps -contains $_.content })
-                $otherRecords = @($apexRecords | Where-Object { $_.content -ne $HostPapaIp -and $GhPagesIps -notcontains $_.content })
-
-                $allGhPagesPresent = ($GhPagesIps | Where-Object {
-                        $ip = $_
-                        $ghPagesRecords | Where-Object { $_.content -eq $ip }
-                    }).Count -eq $GhPagesIps.Count
+                # One pass sorts every apex A record into HostPapa / GH Pages /
+                # other, instead of one filter per bucket.
+                $hostPapaRecords = [System.Collections.Generic.List[object]]::new()
+                $otherRecords = [System.Collections.Generic.List[object]]::new()
+                $presentIps = [System.Collections.Generic.HashSet[string]]::new()
+                foreach ($r in $apexRecords) {
+                    if ($r.content -eq $HostPapaIp) { $hostPapaRecords.Add($r) }
+                    elseif ($ghPagesIpSet.Contains($r.content)) { $null = $presentIps.Add($r.content) }
+                    else { $otherRecords.Add($r) }
+                }
+                $missingIps = @($GhPagesIps | Where-Object { -not $presentIps.Contains($_) })
+                $allGhPagesPresent = ($missingIps.Count -eq 0)
 
                 if ($hostPapaRecords.Count -eq 0 -and $allGhPagesPresent -and $otherRecords.Count -eq 0) {
                     Write-Host "[$domain]   Already correct: 4 GH Pages A records, no HostPapa IP. No DNS change needed."
@@ -445,9 +462,8 @@ foreach ($domain in $domainList) {
                 }
                 else {
                     # Report what we'll do
-                    $toDelete = @($apexRecords | Where-Object { $_.content -eq $HostPapaIp })
-                    $ipsAlreadyPresent = @($ghPagesRecords | ForEach-Object { $_.content })
-                    $toCreate = @($GhPagesIps | Where-Object { $ipsAlreadyPresent -notcontains $_ })
+                    $toDelete = @($hostPapaRecords)
+                    $toCreate = $missingIps
 
                     if ($toDelete.Count -gt 0) {
                         foreach ($r in $toDelete) {
@@ -475,39 +491,100 @@ foreach ($domain in $domainList) {
                     else {
                         $dnsErrors = @()
 
-                        # Delete HostPapa record(s). Invoke-CfApi throws on any
-                        # failure (with the Cloudflare JSON errors in the
-                        # message), so a single catch covers both HTTP and
-                        # envelope failures.
-                        foreach ($r in $toDelete) {
-                            Write-Host "[$domain]   Deleting A -> $($r.content) (id=$($r.id))..."
+                        $posts = @($toCreate | ForEach-Object {
+                                @{
+                                    type    = 'A'
+                                    name    = $domain
+                                    content = $_
+                                    ttl     = 1
+                                    proxied = $false
+                                }
+                            })
+
+                        # The HostPapa deletes and the GH Pages creates go out
+                        # as ONE batch call. Cloudflare applies a batch as a
+                        # single transaction, so the apex is never left
+                        # half-flipped. A REFUSED batch (4xx) has written
+                        # nothing and falls back to one call per record below.
+                        # Any other failure (timeout, 5xx) may have committed,
+                        # so the apex is listed again first and only what is
+                        # still left is applied.
+                        $batched = $false
+                        $pendingDeletes = @($toDelete)
+                        if (($toDelete.Count + $posts.Count) -gt 1) {
+                            Write-Host "[$domain]   Applying $($toDelete.Count) delete(s) and $($posts.Count) create(s) in one batch..."
                             try {
-                                $null = Invoke-CfApi -Method DELETE -Token $zone.Token -Path "/zones/$($zone.ZoneId)/dns_records/$($r.id)"
-                                Write-Host "[$domain]   Deleted A -> $($r.content)"
+                                $null = Invoke-CfDnsBatch -ZoneId $zone.ZoneId -Token $zone.Token -Deletes @($toDelete | ForEach-Object { $_.id }) -Posts $posts
+                                # One write for the whole batch, not a line per record.
+                                $applied = [System.Collections.Generic.List[string]]::new()
+                                foreach ($r in $toDelete) { $applied.Add("[$domain]   Deleted A -> $($r.content) (id=$($r.id))") }
+                                foreach ($ip in $toCreate) { $applied.Add("[$domain]   Created A -> $ip") }
+                                Write-Host ($applied -join [Environment]::NewLine)
+                                $batched = $true
                             }
                             catch {
-                                Write-Warning "[$domain]   DELETE error: $($_.Exception.Message)"
-                                $dnsErrors += "DELETE $($r.content): $($_.Exception.Message)"
+                                if (Test-CfRequestRefused -ErrorRecord $_) {
+                                    Write-Warning "[$domain]   Batch refused ($($_.Exception.Message)); applying one record at a time."
+                                }
+                                else {
+                                    Write-Warning "[$domain]   Batch did not complete ($($_.Exception.Message)); re-listing the apex before applying anything else."
+                                    try {
+                                        # Plain GET, never the ETag cache: this
+                                        # read decides whether the batch landed.
+                                        $apexNow = @(Get-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token -Type A -Name $domain)
+                                        $idsNow = [System.Collections.Generic.HashSet[string]]::new([string[]]@($apexNow | ForEach-Object { $_.id }))
+                                        $ipsNow = [System.Collections.Generic.HashSet[string]]::new([string[]]@($apexNow | ForEach-Object { $_.content }))
+                                        $pendingDeletes = @($toDelete | Where-Object { $idsNow.Contains($_.id) })
+                                        $posts = @($posts | Where-Object { -not $ipsNow.Contains($_.content) })
+                                        if (($pendingDeletes.Count + $posts.Count) -eq 0) {
+                                            $applied = [System.Collections.Generic.List[string]]::new()
+                                            $applied.Add("[$domain]   The batch was applied after all:")
+                                            foreach ($r in $toDelete) { $applied.Add("[$domain]   Deleted A -> $($r.content) (id=$($r.id))") }
+                                            foreach ($ip in $toCreate) { $applied.Add("[$domain]   Created A -> $ip") }
+                                            Write-Host ($applied -join [Environment]::NewLine)
+                                        }
+                                    }
+                                    catch {
+                                        # Nothing safe to replay without knowing the apex.
+                                        Write-Warning "[$domain]   Re-list failed ($($_.Exception.Message)); re-run to finish this domain."
+                                        $dnsErrors += "BATCH outcome unknown: $($_.Exception.Message) (re-run to converge)"
+                                        $pendingDeletes = @()
+                                        $posts = @()
+                                    }
+                                }
                             }
                         }
 
-                        # Create missing GH Pages A records
-                        foreach ($ip in $toCreate) {
-                            Write-Host "[$domain]   Creating A -> $ip (proxied=false)..."
-                            $body = @{
-                                type    = 'A'
-                                name    = $domain
-                                content = $ip
-                                ttl     = 1
-                                proxied = $false
+                        if (-not $batched) {
+                            # Deletes concurrently on PowerShell 7. Outcomes
+                            # come back in $pendingDeletes order, with the
+                            # Cloudflare JSON errors in any failure message.
+                            if ($pendingDeletes.Count -gt 0) {
+                                Write-Host "[$domain]   Deleting $($pendingDeletes.Count) HostPapa A record(s)..."
+                                $deletes = @(Remove-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token -RecordIds @($pendingDeletes | ForEach-Object { $_.id }))
+                                for ($i = 0; $i -lt $pendingDeletes.Count; $i++) {
+                                    $r = $pendingDeletes[$i]
+                                    if ($deletes[$i].Error) {
+                                        Write-Warning "[$domain]   DELETE error: $($deletes[$i].Error)"
+                                        $dnsErrors += "DELETE $($r.content): $($deletes[$i].Error)"
+                                    }
+                                    else {
+                                        Write-Host "[$domain]   Deleted A -> $($r.content) (id=$($r.id))"
+                                    }
+                                }
                             }
-                            try {
-                                $null = Invoke-CfApi -Method POST -Token $zone.Token -Path "/zones/$($zone.ZoneId)/dns_records" -Body $body
-                                Write-Host "[$domain]   Created A -> $ip"
-                            }
-                            catch {
-                                Write-Warning "[$domain]   CREATE error for $ip : $($_.Exception.Message)"
-                                $dnsErrors += "CREATE $ip : $($_.Exception.Message)"
+
+                            foreach ($body in $posts) {
+                                $ip = $body.content
+                                Write-Host "[$domain]   Creating A -> $ip (proxied=false)..."
+                                try {
+                                    $null = Invoke-CfApi -Method POST -Token $zone.Token -Path "/zones/$($zone.ZoneId)/dns_records" -Body $body
+                                    Write-Host "[$domain]   Created A -> $ip"
+                                }
+                                catch {
+                                    Write-Warning "[$domain]   CREATE error for $ip : $($_.Exception.Message)"
+                                    $dnsErrors += "CREATE $ip : $($_.Exception.Message)"
+                                }
                             }
                         }
 
@@ -529,8 +606,6 @@ foreach ($domain in $domainList) {
                 # org Pages host (dns-only, so Pages can serve the redirect and
                 # issue the www SAN cert). Runs even when the apex was already
                 # correct — the first live cutover shipped apex-only.
-                $wwwName = "www.$domain"
-                $wwwRecords = @(Get-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token -Name $wwwName)
                 $wwwGood = @($wwwRecords | Where-Object { $_.type -eq 'CNAME' -and $_.content -eq $WwwTarget -and -not $_.proxied })
 
                 if ($wwwGood.Count -gt 0 -and $wwwRecords.Count -eq $wwwGood.Count) {
@@ -576,7 +651,7 @@ foreach ($domain in $domainList) {
         }
     }
 
-    $results += $result
+    $results.Add($result)
     Write-Host ''
 }
 
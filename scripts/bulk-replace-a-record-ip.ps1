@@ -26,6 +26,10 @@
 .PARAMETER DryRun
     If set, no PATCH calls are made. Discovery + report only.
 
+.PARAMETER ThrottleLimit
+    Zones scanned concurrently (PowerShell 7+; 5.1 scans serially). Cloudflare
+    allows 1200 requests / 5 min per token, so keep this small.
+
 .EXAMPLE
     $env:CLOUDFLARE_API_TOKEN_FFC = '...'
     $env:CLOUDFLARE_API_TOKEN_CM  = '...'
@@ -41,12 +45,26 @@ param(
     [ValidatePattern('^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')]
     [string]$NewIp,
 
-    [switch]$DryRun
+    [switch]$DryRun,
+
+    [ValidateRange(1, 16)]
+    [int]$ThrottleLimit = 4
 )
 
 $ErrorActionPreference = 'Stop'
 
-# Shared Cloudflare helpers (#778): Invoke-CfApi, Get-CfEnvTokens,
+# The pattern above still lets through octets like 999. Reject those here,
+# before any zone is listed, rather than learn it from a 400 on the first
+# PATCH of a real run.
+foreach ($arg in @(@('OldIp', $OldIp), @('NewIp', $NewIp))) {
+    $parsedIp = $null
+    if (-not [System.Net.IPAddress]::TryParse($arg[1], [ref]$parsedIp) -or
+        $parsedIp.AddressFamily -ne [System.Net.Sockets.AddressFamily]::InterNetwork) {
+        throw "-$($arg[0]) '$($arg[1])' is not a valid IPv4 address."
+    }
+}
+
+# Shared Cloudflare helpers (#778): Invoke-CfApi, Get-CfEnvTokens, Get-CfZones,
 # Get-CfDnsRecords (server-side type+content filtering).
 . (Join-Path $PSScriptRoot 'cloudflare-api-common.ps1')
 
@@ -55,19 +73,21 @@ if ($tokens.Count -eq 0) {
     throw 'No Cloudflare tokens found. Set CLOUDFLARE_API_TOKEN_FFC and/or CLOUDFLARE_API_TOKEN_CM.'
 }
 
-function Get-AllZones {
-    param([string]$Token)
-    $zones = @()
-    $page = 1
-    while ($true) {
-        # Invoke-CfApi throws on failure with the Cloudflare errors included.
-        $resp = Invoke-CfApi -Method GET -Token $Token -Path "/zones?per_page=50&page=$page"
-        $zones += $resp.result
-        $totalPages = $resp.result_info.total_pages
-        if ($page -ge $totalPages) { break }
-        $page += 1
+function Find-ZoneARecord {
+    # The zone's A records pointing at -Content, as an outcome object: a failed
+    # listing is reported by the caller rather than aborting the whole scan.
+    param(
+        [Parameter(Mandatory = $true)]$Zone,
+        [Parameter(Mandatory = $true)][string]$Token,
+        [Parameter(Mandatory = $true)][string]$Content
+    )
+    try {
+        $records = @(Get-CfDnsRecords -ZoneId $Zone.id -Token $Token -Type A -Content $Content)
+        [pscustomobject]@{ Zone = $Zone; Records = $records; Error = $null }
+    }
+    catch {
+        [pscustomobject]@{ Zone = $Zone; Records = @(); Error = $_.Exception.Message }
     }
-    return $zones
 }
 
 Write-Host "=== Bulk A-record IP replacement ==="
@@ -77,32 +97,51 @@ Write-Host "Mode   : $(if ($DryRun) { 'DRY-RUN (no changes)' } else { 'APPLY (wi
 Write-Host "Tokens : $(($tokens | ForEach-Object { $_.name }) -join ', ')"
 Write-Host ''
 
-$plan = @()
+$plan = [System.Collections.Generic.List[object]]::new()
+
+# Every zone is one independent filtered listing and the time is all spent
+# waiting on Cloudflare, so the scan fans out across runspaces where
+# PowerShell allows it. Each runspace dot-sources the library again.
+$useParallel = ($PSVersionTable.PSVersion.Major -ge 7 -and $ThrottleLimit -gt 1)
+$libPath = $script:CfLibPath
+$findFn = ${function:Find-ZoneARecord}.ToString()
 
 foreach ($t in $tokens) {
     Write-Host "[Account: $($t.name)] Listing zones..."
-    $zones = Get-AllZones -Token $t.token
+    $zones = @(Get-CfZones -Token $t.token)
     Write-Host "[Account: $($t.name)] Found $($zones.Count) zones"
-    foreach ($z in $zones) {
-        try {
-            $matchingRecords = @(Get-CfDnsRecords -ZoneId $z.id -Token $t.token -Type A -Content $OldIp)
-        }
-        catch {
-            Write-Warning "[$($t.name) :: $($z.name)] List failed: $($_.Exception.Message)"
+    $token = $t.token
+    if ($useParallel) {
+        # Completion order is arbitrary; the zone listing is name-ordered, so
+        # sorting by name keeps the plan in the order a serial scan produced.
+        $scans = @($zones | ForEach-Object -ThrottleLimit $ThrottleLimit -Parallel {
+                $lib = $using:libPath
+                . $lib
+                ${function:Find-ZoneARecord} = $using:findFn
+                Find-ZoneARecord -Zone $_ -Token $using:token -Content $using:OldIp
+            } | Sort-Object { $_.Zone.name })
+    }
+    else {
+        $scans = @($zones | ForEach-Object { Find-ZoneARecord -Zone $_ -Token $token -Content $OldIp })
+    }
+    foreach ($scan in $scans) {
+        $z = $scan.Zone
+        if ($scan.Error) {
+            Write-Warning "[$($t.name) :: $($z.name)] List failed: $($scan.Error)"
             continue
         }
-        foreach ($r in $matchingRecords) {
-            $plan += [pscustomobject]@{
-                Account    = $t.name
-                Token      = $t.token
-                Zone       = $z.name
-                ZoneId     = $z.id
-                RecordId   = $r.id
-                Name       = $r.name
-                OldContent = $r.content
-                Proxied    = [bool]$r.proxied
-                Ttl        = $r.ttl
-            }
+        foreach ($r in $scan.Records) {
+            $plan.Add([pscustomobject]@{
+                    Account    = $t.name
+                    Token      = $t.token
+                    Zone       = $z.name
+                    ZoneId     = $z.id
+                    RecordId   = $r.id
+                    Name       = $r.name
+                    OldContent = $r.content
+                    Proxied    = [bool]$r.proxied
+                    Ttl        = $r.ttl
+                })
         }
     }
 }
@@ -143,8 +182,8 @@ if ($DryRun) {
 
 Write-Host ''
 Write-Host '=== Applying changes ==='
-$succeeded = @()
-$failed = @()
+$succeeded = [System.Collections.Generic.List[object]]::new()
+$failed = [System.Collections.Generic.List[object]]::new()
 
 foreach ($p in $plan) {
     $body = @{
@@ -157,14 +196,15 @@ foreach ($p in $plan) {
     try {
         # Invoke-CfApi throws on any failure (with the Cloudflare JSON errors
         # in the message), so a single catch covers both HTTP and envelope
-        # failures.
-        $null = Invoke-CfApi -Method PATCH -Token $p.Token -Path "/zones/$($p.ZoneId)/dns_records/$($p.RecordId)" -Body $body
+        # failures. The body sets fixed values, so sending it twice is
+        # harmless: -Idempotent keeps the retry on a 5xx or timeout.
+        $null = Invoke-CfApi -Method PATCH -Token $p.Token -Path "/zones/$($p.ZoneId)/dns_records/$($p.RecordId)" -Body $body -Idempotent
         Write-Host "OK   [$($p.Account)] $($p.Zone) :: $($p.Name) -> $NewIp"
-        $succeeded += $p
+        $succeeded.Add($p)
     }
     catch {
         Write-Warning "FAIL [$($p.Account)] $($p.Zone) :: $($p.Name) -> $($_.Exception.Message)"
-        $failed += $p
+        $failed.Add($p)
     }
 }
 
@@ -80,7 +80,7 @@ Write-Host "Domains ($($domainList.Count)):"
 $domainList | ForEach-Object { Write-Host "  - $_" }
 Write-Host ''
 
-$results = @()
+$results = [System.Collections.Generic.List[object]]::new()
 
 foreach ($domain in $domainList) {
     $fqdn = "staging.$domain"
@@ -89,14 +89,14 @@ foreach ($domain in $domainList) {
     $zone = Resolve-CfZone -Domain $domain -Tokens $tokens
     if (-not $zone) {
         Write-Warning "[$domain] Zone not found via any available token. Skipping."
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'SKIP'
-            Detail  = 'Zone not found'
-            Deleted = 0
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'SKIP'
+                Detail  = 'Zone not found'
+                Deleted = 0
+                Created = $false
+            })
         continue
     }
     Write-Host "[$domain] Zone resolved via $($zone.Account) token (zone id $($zone.ZoneId))"
@@ -106,14 +106,14 @@ foreach ($domain in $domainList) {
     }
     catch {
         Write-Warning "[$domain] List failed: $($_.Exception.Message)"
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'FAIL'
-            Detail  = "List error: $($_.Exception.Message)"
-            Deleted = 0
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'FAIL'
+                Detail  = "List error: $($_.Exception.Message)"
+                Deleted = 0
+                Created = $false
+            })
         continue
     }
 
@@ -132,14 +132,14 @@ foreach ($domain in $domainList) {
     $needsWork = $true
     if ($alreadyCorrect -and $existing.Count -eq 1) {
         Write-Host "[$domain] Already correct: CNAME -> $Target (proxied=false). No action."
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'OK'
-            Detail  = 'Already correct'
-            Deleted = 0
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'OK'
+                Detail  = 'Already correct'
+                Deleted = 0
+                Created = $false
+            })
         $needsWork = $false
     }
 
@@ -147,34 +147,37 @@ foreach ($domain in $domainList) {
 
     $deletedCount = 0
     $deleteErrors = @()
-    foreach ($r in $existing) {
-        if ($DryRun) {
+    if ($DryRun) {
+        foreach ($r in $existing) {
             Write-Host "  [DRY-RUN] Would DELETE $($r.type) $($r.name) -> $($r.content) (id=$($r.id))"
-            continue
-        }
-        try {
-            # Invoke-CfApi throws on any failure (with the Cloudflare JSON
-            # errors in the message), so a single catch covers both HTTP and
-            # envelope failures.
-            $null = Invoke-CfApi -Method DELETE -Token $zone.Token -Path "/zones/$($zone.ZoneId)/dns_records/$($r.id)"
-            Write-Host "  Deleted $($r.type) $($r.name) -> $($r.content)"
-            $deletedCount += 1
         }
-        catch {
-            Write-Warning "  DELETE error for id $($r.id): $($_.Exception.Message)"
-            $deleteErrors += $_.Exception.Message
+    }
+    elseif ($existing.Count -gt 0) {
+        # Concurrent on PowerShell 7; outcomes come back in $existing order,
+        # with the Cloudflare JSON errors in any failure message.
+        $deletes = @(Remove-CfDnsRecords -ZoneId $zone.ZoneId -Token $zone.Token -RecordIds @($existing | ForEach-Object { $_.id }))
+        for ($i = 0; $i -lt $existing.Count; $i++) {
+            $r = $existing[$i]
+            if ($deletes[$i].Error) {
+                Write-Warning "  DELETE error for id $($r.id): $($deletes[$i].Error)"
+                $deleteErrors += $deletes[$i].Error
+            }
+            else {
+                Write-Host "  Deleted $($r.type) $($r.name) -> $($r.content)"
+                $deletedCount += 1
+            }
         }
     }
 
     if ($deleteErrors.Count -gt 0) {
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'FAIL'
-            Detail  = "Delete errors: $($deleteErrors -join ' | ')"
-            Deleted = $deletedCount
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'FAIL'
+                Detail  = "Delete errors: $($deleteErrors -join ' | ')"
+                Deleted = $deletedCount
+                Created = $false
+            })
         continue
     }
 
@@ -187,39 +190,39 @@ foreach ($domain in $domainList) {
     }
     if ($DryRun) {
         Write-Host "  [DRY-RUN] Would CREATE CNAME $fqdn -> $Target (proxied=false)"
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'DRY-RUN'
-            Detail  = "Would delete $($existing.Count), create CNAME"
-            Deleted = 0
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'DRY-RUN'
+                Detail  = "Would delete $($existing.Count), create CNAME"
+                Deleted = 0
+                Created = $false
+            })
         continue
     }
 
     try {
         $null = Invoke-CfApi -Method POST -Token $zone.Token -Path "/zones/$($zone.ZoneId)/dns_records" -Body $body
         Write-Host "  Created CNAME $fqdn -> $Target (proxied=false)"
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'OK'
-            Detail  = 'CNAME created'
-            Deleted = $deletedCount
-            Created = $true
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'OK'
+                Detail  = 'CNAME created'
+                Deleted = $deletedCount
+                Created = $true
+            })
     }
     catch {
         Write-Warning "  CREATE error: $($_.Exception.Message)"
-        $results += [pscustomobject]@{
-            Domain  = $domain
-            Fqdn    = $fqdn
-            Status  = 'FAIL'
-            Detail  = "Create exception: $($_.Exception.Message)"
-            Deleted = $deletedCount
-            Created = $false
-        }
+        $results.Add([pscustomobject]@{
+                Domain  = $domain
+                Fqdn    = $fqdn
+                Status  = 'FAIL'
+                Detail  = "Create exception: $($_.Exception.Message)"
+                Deleted = $deletedCount
+                Created = $false
+            })
     }
 }
 
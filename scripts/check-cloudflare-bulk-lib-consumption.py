@@ -63,7 +63,11 @@ REQUIRED_LIB_FUNCS = [
     "Get-CfEnvTokens",
     "Resolve-CfZone",
     "Resolve-CfZoneId",
+    "Get-CfZones",
     "Get-CfDnsRecords",
+    "Remove-CfDnsRecords",
+    "Invoke-CfDnsBatch",
+    "Test-CfRequestRefused",
     "Get-GhPagesIps",
     "Get-GhPagesIpv6s",
     "Get-GhPagesWwwTarget",
@@ -77,7 +81,11 @@ BANNED_CONSUMER_FUNCS = [
     "Invoke-CfProbe",
     "Resolve-CfZone",
     "Resolve-CfZoneId",
+    "Get-CfZones",
     "Get-CfDnsRecords",
+    "Remove-CfDnsRecords",
+    "Invoke-CfDnsBatch",
+    "Test-CfRequestRefused",
     "Get-GhPagesIps",
     "Get-GhPagesIpv6s",
     "Get-GhPagesWwwTarget",
@@ -195,7 +203,11 @@ function Invoke-CfApi { }
 function Get-CfEnvTokens { }
 function Resolve-CfZone { }
 function Resolve-CfZoneId { }
+function Get-CfZones { }
 function Get-CfDnsRecords { }
+function Remove-CfDnsRecords { }
+function Invoke-CfDnsBatch { }
+function Test-CfRequestRefused { }
 function Get-GhPagesIps { }
 function Get-GhPagesIpv6s { }
 function Get-GhPagesWwwTarget { }
@@ -9,8 +9,11 @@
     One source of truth for (issue #778):
       - Invoke-CfApi        : Cloudflare REST call with real error surfacing
                               (Cloudflare JSON errors end up in the thrown
-                              message) and a single retry on transient
-                              5xx/timeout failures.
+                              message) and bounded retries with exponential
+                              backoff on 429 (honouring Retry-After) and
+                              transient 5xx/timeout failures. -Conditional
+                              GETs revalidate against the ETag cache below
+                              (PowerShell 7).
       - Get-CfEnvTokens     : FFC + CM token discovery from the environment
                               (the same env vars the cloudflare-tokens-from-kv
                               composite action exports).
@@ -19,8 +22,23 @@
                               returns $null when no token can see the zone —
                               same semantics as the private copies the bulk
                               scripts used to carry).
+                              Resolved ids are cached on disk for 24h (see
+                              Get-CfZoneCachePath).
+      - Read-CfHttpCache /
+        Write-CfHttpCache   : ETag cache for conditional GETs (If-None-Match
+                              -> 304 reuses the stored body). Entries expire
+                              and are pruned after 24h.
+      - Get-CfZones         : every zone a token can see (pages 2..N
+                              fetched concurrently on PowerShell 7).
       - Get-CfDnsRecords    : paginated DNS record listing, filterable by
                               type/name/content.
+      - Remove-CfDnsRecords : deletes records by id (concurrently on
+                              PowerShell 7), one { Id; Error } outcome each.
+      - Invoke-CfDnsBatch   : record deletes and creates in one
+                              transactional POST /dns_records/batch.
+      - Test-CfRequestRefused : tells a refused call (4xx, nothing
+                              applied) from one whose outcome is unknown
+                              (timeout, 5xx) before a caller replays it.
       - Get-GhPagesIps / Get-GhPagesIpv6s / Get-GhPagesWwwTarget :
                               the canonical GitHub Pages apex IP sets and the
                               FFC org Pages host for the www CNAME.
@@ -33,6 +51,29 @@
 
 $script:CfApiBase = 'https://api.cloudflare.com/client/v4'
 
+# This file, so ForEach-Object -Parallel runspaces can dot-source it again.
+$script:CfLibPath = $PSCommandPath
+
+# Page size for /zones/{id}/dns_records listings. Cloudflare accepts up to 5000
+# per page on this endpoint (the 100 default just costs round-trips), and the
+# listing still follows result_info.total_pages, so a larger zone is never
+# truncated. /zones itself caps at 50 and keeps its own literal.
+$script:CfDnsRecordsPerPage = 5000
+
+# One web session for every Cloudflare call made by this process. On
+# PowerShell 7.4+ the session owns the underlying HttpClient, so the TCP/TLS
+# connection to api.cloudflare.com is reused across calls instead of being
+# renegotiated per request (5.1 already pools through ServicePointManager).
+$script:CfWebSession = New-Object Microsoft.PowerShell.Commands.WebRequestSession
+
+# Ask for HTTP/2 where the cmdlets can (-HttpVersion arrived in PowerShell
+# 7.3). Calls that share the session's connection then multiplex over it, and
+# .NET still falls back to HTTP/1.1 if the server will not negotiate h2. Null
+# on older hosts, which keep their default. Decided from the version rather
+# than Get-Command's parameter metadata: this file loads in every parallel
+# runspace, and that lookup is a measurable part of a runspace's start-up.
+$script:CfHttpVersion = if ($PSVersionTable.PSVersion -ge [version]'7.3') { [version]'2.0' }
+
 # ---------------------------------------------------------------------------
 # Canonical GitHub Pages DNS targets (single source of truth — issue #778).
 # Do NOT copy these values into other scripts; consume the Get-* functions.
@@ -156,13 +197,104 @@ function Get-CfEnvTokens {
 # ---------------------------------------------------------------------------
 # REST plumbing
 # ---------------------------------------------------------------------------
+# Request headers per token, built on first use and shared by every call after
+# that. Treat the returned hashtable as read-only: it is the same object for
+# every request made with that token.
+$script:CfHeaderCache = @{}
+
+function Get-CfRequestHeaders {
+    [OutputType([hashtable])]
+    param([Parameter(Mandatory = $true)][string]$Token)
+
+    $headers = $script:CfHeaderCache[$Token]
+    if (-not $headers) {
+        $headers = @{
+            Authorization  = "Bearer $Token"
+            'Content-Type' = 'application/json'
+        }
+        $script:CfHeaderCache[$Token] = $headers
+    }
+    return $headers
+}
+
+function Get-CfRetryAfterSeconds {
+    <#
+        Seconds a throttled (429) response asked us to wait, from its
+        Retry-After header, or $null when it did not say. Handles both the
+        PowerShell 7 HttpResponseMessage and the 5.1 WebResponse shapes, and
+        both header forms (delta-seconds and HTTP-date).
+    #>
+    param($Response)
+
+    if (-not $Response) { return $null }
+    try {
+        if ($Response -is [System.Net.Http.HttpResponseMessage]) {
+            $ra = $Response.Headers.RetryAfter
+            if ($ra -and $ra.Delta) { return [int][math]::Ceiling($ra.Delta.TotalSeconds) }
+            if ($ra -and $ra.Date) { return [int][math]::Max(0, [math]::Ceiling(($ra.Date - [DateTimeOffset]::UtcNow).TotalSeconds)) }
+            return $null
+        }
+        $raw = $Response.Headers['Retry-After']
+        if (-not $raw) { return $null }
+        $seconds = 0
+        if ([int]::TryParse($raw, [ref]$seconds)) { return $seconds }
+        $when = [DateTimeOffset]::MinValue
+        if ([DateTimeOffset]::TryParse($raw, [ref]$when)) {
+            return [int][math]::Max(0, [math]::Ceiling(($when - [DateTimeOffset]::UtcNow).TotalSeconds))
+        }
+    }
+    catch {
+        return $null
+    }
+    return $null
+}
+
+function Get-CfRetryDelay {
+    <#
+        Seconds to wait before retrying after failed attempt number -Attempt.
+        A throttled response's Retry-After (capped at 120s) wins; otherwise
+        exponential backoff (1s, 2s, 4s, ... capped at 30s) plus up to 25%
+        random jitter, so parallel workers throttled together do not all
+        come back in the same second.
+    #>
+    [OutputType([double])]
+    param(
+        [Parameter(Mandatory = $true)][int]$Attempt,
+        $RetryAfter
+    )
+
+    if ($null -ne $RetryAfter) { return [double][math]::Min(120, [math]::Max(1, $RetryAfter)) }
+    $base = [math]::Min(30, [math]::Pow(2, $Attempt - 1))
+    return [math]::Round($base + (Get-Random -Minimum 0.0 -Maximum ($base * 0.25)), 2)
+}
+
 function Invoke-CfApi {
     <#
         Cloudflare REST call. Throws on failure with the Cloudflare JSON
         errors included in the message (Invoke-RestMethod normally hides the
-        response body inside ErrorDetails). Retries ONCE on transient
-        failures (HTTP 5xx or timeout); envelope failures (success=false)
-        and 4xx are never retried.
+        response body inside ErrorDetails).
+
+        Retries up to -MaxAttempts in total on HTTP 429 and, for idempotent
+        methods (GET/PUT/DELETE), on transient failures (HTTP 5xx or
+        timeout), with jittered exponential backoff (see Get-CfRetryDelay).
+        A 429 that carries Retry-After waits that long instead. Cloudflare
+        throttles bursts (1200 requests / 5 min per token), and waiting out
+        a 429 is far cheaper than failing a bulk run halfway. A POST or PATCH
+        that hit a 5xx or timed out may already have been applied, so it is
+        not sent again (a second POST would create a duplicate record).
+        Envelope failures (success=false) and other 4xx are never retried.
+
+        -Idempotent: the caller vouches that sending this request twice
+        leaves the same result as sending it once (e.g. a PATCH that sets
+        fixed values), so it gets the GET/PUT/DELETE retries too. Never pass
+        it for a POST that creates something.
+
+        -Conditional (GET, PowerShell 7 only -- it needs the response
+        headers): send If-None-Match with the ETag cached from the last
+        identical GET, and on 304 return the cached body instead of
+        re-downloading it. For read-only listings (exports, audits) only:
+        nothing here proves Cloudflare changes the ETag on every write, so a
+        read that decides a write is always a plain GET.
     #>
     [CmdletBinding()]
     param(
@@ -170,28 +302,49 @@ function Invoke-CfApi {
         [Parameter(Mandatory = $true)][string]$Path,
         [Parameter(Mandatory = $true)][string]$Token,
         $Body,
-        [int]$TimeoutSec = 30
+        [int]$TimeoutSec = 30,
+        [ValidateRange(1, 10)]
+        [int]$MaxAttempts = 5,
+        [switch]$Conditional,
+        [switch]$Idempotent
     )
 
     $requestParams = @{
         Method      = $Method
         Uri         = "$script:CfApiBase$Path"
-        Headers     = @{ Authorization = "Bearer $Token"; 'Content-Type' = 'application/json' }
+        Headers     = (Get-CfRequestHeaders -Token $Token)
         TimeoutSec  = $TimeoutSec
+        WebSession  = $script:CfWebSession
         ErrorAction = 'Stop'
     }
     if ($null -ne $Body) { $requestParams.Body = ($Body | ConvertTo-Json -Depth 10 -Compress) }
+    if ($script:CfHttpVersion) { $requestParams.HttpVersion = $script:CfHttpVersion }
+
+    $useCache = ($Conditional -and $Method -eq 'GET' -and $PSVersionTable.PSVersion.Major -ge 7)
+    $cached = $null
+    if ($useCache) {
+        $cached = Read-CfHttpCache -Token $Token -Uri $requestParams.Uri
+        if ($cached) { $requestParams.Headers = $requestParams.Headers + @{ 'If-None-Match' = [string]$cached.ETag } }
+        $requestParams.ResponseHeadersVariable = 'cfResponseHeaders'
+        $requestParams.StatusCodeVariable = 'cfStatusCode'
+    }
 
-    $maxAttempts = 2
-    for ($attempt = 1; $attempt -le $maxAttempts; $attempt++) {
+    for ($attempt = 1; $attempt -le $MaxAttempts; $attempt++) {
         try {
             $resp = Invoke-RestMethod @requestParams
+            # 304: unchanged since it was cached -- no body came back. (Some
+            # PowerShell versions return it; the others throw, see catch.)
+            if ($useCache -and $cached -and $cfStatusCode -eq 304) { return $cached.Body }
             # Cloudflare envelope: treat success=false as a failure even on HTTP 2xx.
             if ($resp -and ($resp.PSObject.Properties.Name -contains 'success') -and -not $resp.success) {
                 $errJson = $null
                 try { $errJson = ($resp.errors | ConvertTo-Json -Depth 6 -Compress) } catch { $errJson = [string]$resp.errors }
                 throw "Cloudflare API error ($Method $Path): $errJson"
             }
+            if ($useCache -and $cfResponseHeaders -and $cfResponseHeaders['ETag']) {
+                $etag = [string](@($cfResponseHeaders['ETag'])[0])
+                Write-CfHttpCache -Token $Token -Uri $requestParams.Uri -ETag $etag -Body ($resp | ConvertTo-Json -Depth 20 -Compress)
+            }
             return $resp
         }
         catch {
@@ -199,11 +352,17 @@ function Invoke-CfApi {
             if ($exMsg -like 'Cloudflare API error*') { throw }
 
             $statusCode = $null
+            $retryAfter = $null
             try {
-                if ($_.Exception.Response) { $statusCode = [int]$_.Exception.Response.StatusCode }
+                if ($_.Exception.Response) {
+                    $statusCode = [int]$_.Exception.Response.StatusCode
+                    if ($statusCode -eq 429) { $retryAfter = Get-CfRetryAfterSeconds -Response $_.Exception.Response }
+                }
             }
             catch { $statusCode = $null }
 
+            if ($statusCode -eq 304 -and $cached) { return $cached.Body }
+
             # Surface the Cloudflare JSON errors from the hidden response body.
             $cfErrors = $null
             if ($_.ErrorDetails -and $_.ErrorDetails.Message) {
@@ -225,20 +384,236 @@ function Invoke-CfApi {
             $detail += ": $exMsg"
             if ($cfErrors) { $detail += " | errors: $cfErrors" }
 
-            $isTransient = ($statusCode -ge 500 -and $statusCode -le 599) -or ($exMsg -match '(?i)timed?\s?out|timeout')
-            if ($isTransient -and $attempt -lt $maxAttempts) {
-                Write-Warning "$detail — transient; retrying once in 2s..."
-                Start-Sleep -Seconds 2
+            $isThrottled = ($statusCode -eq 429)
+            $isIdempotent = ($Idempotent -or $Method -in @('GET', 'PUT', 'DELETE'))
+            $isTransient = $isIdempotent -and (($statusCode -ge 500 -and $statusCode -le 599) -or ($exMsg -match '(?i)timed?\s?out|timeout'))
+            if (($isThrottled -or $isTransient) -and $attempt -lt $MaxAttempts) {
+                $delay = Get-CfRetryDelay -Attempt $attempt -RetryAfter $(if ($isThrottled) { $retryAfter })
+                $why = if ($isThrottled) { 'rate limited' } else { 'transient' }
+                Write-Warning "$detail — $why; retrying in ${delay}s (attempt $($attempt + 1) of $MaxAttempts)..."
+                Start-Sleep -Milliseconds ([int]($delay * 1000))
                 continue
             }
-            throw $detail
+            # The status rides along so a caller can tell a refusal (4xx:
+            # nothing was applied) from an outcome it cannot know (see
+            # Test-CfRequestRefused).
+            $ex = [System.Exception]::new($detail)
+            $ex.Data['CfStatusCode'] = $statusCode
+            throw $ex
         }
     }
 }
 
+function Test-CfRequestRefused {
+    <#
+        $true when the failed call in -ErrorRecord was refused by Cloudflare,
+        i.e. it answered with a 4xx or a success=false envelope and applied
+        nothing. $false for a timeout, a dropped connection or a 5xx, where a
+        write may or may not have landed: replaying it could apply it twice,
+        so the caller has to look at the zone again (or stop) instead.
+        Understands both this library's Invoke-CfApi and the engine's copy in
+        Update-CloudflareDns.ps1: both record the HTTP status in
+        Exception.Data['CfStatusCode'], and the engine's Windows PowerShell
+        path flags a success=false envelope with Data['CfEnvelopeRefused'].
+    #>
+    [OutputType([bool])]
+    param([Parameter(Mandatory = $true)][System.Management.Automation.ErrorRecord]$ErrorRecord)
+
+    $ex = $ErrorRecord.Exception
+    if ($ex.Message -like 'Cloudflare API error*') { return $true }
+    if ($ex.Data['CfEnvelopeRefused']) { return $true }
+    $statusCode = $null
+    try { $statusCode = $ex.Data['CfStatusCode'] } catch { $statusCode = $null }
+    if (-not $statusCode) { return $false }
+    # Below 400 only when the HTTP call succeeded and the envelope said no.
+    return ([int]$statusCode -lt 500)
+}
+
 # ---------------------------------------------------------------------------
 # Zone resolution (multi-token: FFC then CM)
 # ---------------------------------------------------------------------------
+function Get-CfCacheFilePath {
+    <#
+        Path of one on-disk cache entry: <dir>/<Prefix>-<sha256(Text)>.json.
+
+        Directory: $env:FFC_CF_CACHE_DIR, else ~/.cache/ffc-cf. Callers put
+        the token in Text, so entries are per token and the token itself is
+        never written to disk (only its hash is, in the file name).
+    #>
+    [OutputType([string])]
+    param(
+        [Parameter(Mandatory = $true)][string]$Prefix,
+        [Parameter(Mandatory = $true)][string]$Text
+    )
+
+    $dir = if ($env:FFC_CF_CACHE_DIR) { $env:FFC_CF_CACHE_DIR } else { Join-Path (Join-Path $HOME '.cache') 'ffc-cf' }
+    $sha = [System.Security.Cryptography.SHA256]::Create()
+    try {
+        $bytes = $sha.ComputeHash([System.Text.Encoding]::UTF8.GetBytes($Text))
+    }
+    finally {
+        $sha.Dispose()
+    }
+    $key = ([System.BitConverter]::ToString($bytes) -replace '-', '').Substring(0, 32).ToLowerInvariant()
+    return (Join-Path $dir "$Prefix-$key.json")
+}
+
+function Save-CfCacheFile {
+    <#
+        Best-effort atomic write of a cache entry: a temp file renamed into
+        place, so a concurrent reader never sees a half-written entry. A cache
+        that cannot be written (read-only home, locked file) must never fail
+        the call it is meant to speed up.
+    #>
+    param(
+        [Parameter(Mandatory = $true)][string]$Path,
+        [Parameter(Mandatory = $true)][string]$Json
+    )
+
+    try {
+        $dir = Split-Path -Parent $Path
+        if (-not (Test-Path -LiteralPath $dir)) { $null = New-Item -ItemType Directory -Path $dir -Force }
+        $tmp = "$Path.$([guid]::NewGuid().ToString('N')).tmp"
+        Set-Content -LiteralPath $tmp -Value $Json -Encoding utf8
+        Move-Item -LiteralPath $tmp -Destination $Path -Force
+    }
+    catch {
+        Write-Verbose "Cache write skipped for ${Path}: $($_.Exception.Message)"
+    }
+}
+
+function Get-CfZoneCachePath {
+    <#
+        Cache file for one (domain, token) zone lookup. A zone id never changes
+        while the zone exists, yet every invocation used to spend a
+        /zones?name= probe per token to rediscover it. Keyed by domain AND
+        token, so one token never reuses a zone another token resolved.
+    #>
+    [OutputType([string])]
+    param(
+        [Parameter(Mandatory = $true)][string]$Domain,
+        [Parameter(Mandatory = $true)][string]$Token
+    )
+
+    return (Get-CfCacheFilePath -Prefix 'zone' -Text "$($Domain.Trim().ToLowerInvariant())|$Token")
+}
+
+function Read-CfZoneCache {
+    <#
+        Cached @{ ZoneId; ZoneName } for a (domain, token), or $null when absent,
+        older than 24h, unreadable, or FFC_CF_CACHE_BUST=1 is set.
+        -AllowExpired skips the age check, for callers that would rather use
+        a stale id than fail when the lookup itself is failing.
+    #>
+    param(
+        [Parameter(Mandatory = $true)][string]$Domain,
+        [Parameter(Mandatory = $true)][string]$Token,
+        [switch]$AllowExpired
+    )
+
+    if ($env:FFC_CF_CACHE_BUST -eq '1') { return $null }
+    try {
+        $path = Get-CfZoneCachePath -Domain $Domain -Token $Token
+        if (-not (Test-Path -LiteralPath $path)) { return $null }
+        $age = (Get-Date).ToUniversalTime() - (Get-Item -LiteralPath $path).LastWriteTimeUtc
+        if ($age.TotalHours -ge 24 -and -not $AllowExpired) { return $null }
+        $entry = Get-Content -LiteralPath $path -Raw | ConvertFrom-Json
+        if (-not $entry.ZoneId) { return $null }
+        return $entry
+    }
+    catch {
+        return $null
+    }
+}
+
+function Write-CfZoneCache {
+    param(
+        [Parameter(Mandatory = $true)][string]$Domain,
+        [Parameter(Mandatory = $true)][string]$Token,
+        [Parameter(Mandatory = $true)][string]$ZoneId,
+        [Parameter(Mandatory = $true)][string]$ZoneName
+    )
+
+    $path = Get-CfZoneCachePath -Domain $Domain -Token $Token
+    $json = @{ ZoneId = $ZoneId; ZoneName = $ZoneName } | ConvertTo-Json -Compress
+    Save-CfCacheFile -Path $path -Json $json
+}
+
+# HTTP cache entries hold whole listing bodies (every record of a zone), so
+# they are not kept forever: older than this they are a miss and get pruned.
+$script:CfHttpCacheMaxAgeHours = 24
+$script:CfHttpCachePruned = $false
+
+function Remove-CfHttpCacheExpired {
+    <#
+        Deletes HTTP cache entries (and orphaned temp files) older than
+        $script:CfHttpCacheMaxAgeHours from the cache directory. Runs once per
+        process, from the first Write-CfHttpCache; best-effort like every
+        other cache operation.
+    #>
+    param([Parameter(Mandatory = $true)][string]$Directory)
+
+    if ($script:CfHttpCachePruned) { return }
+    $script:CfHttpCachePruned = $true
+    try {
+        if (-not (Test-Path -LiteralPath $Directory)) { return }
+        $cutoff = (Get-Date).ToUniversalTime().AddHours(-$script:CfHttpCacheMaxAgeHours)
+        Get-ChildItem -LiteralPath $Directory -File |
+            Where-Object { ($_.Name -like 'http-*.json' -or $_.Name -like '*.tmp') -and $_.LastWriteTimeUtc -lt $cutoff } |
+            Remove-Item -Force -ErrorAction SilentlyContinue
+    }
+    catch {
+        Write-Verbose "Cache prune skipped for ${Directory}: $($_.Exception.Message)"
+    }
+}
+
+function Read-CfHttpCache {
+    <#
+        Cached { ETag; Body } for a GET, keyed by token + URL, or $null. Used
+        for conditional GETs: the caller sends If-None-Match with the ETag,
+        and on 304 returns Body (the response, already parsed) instead of
+        re-downloading it. Entries older than 24h are ignored, the same
+        policy as the zone cache, and Write-CfHttpCache deletes them (see
+        Remove-CfHttpCacheExpired). FFC_CF_CACHE_BUST=1 disables it like the
+        zone cache.
+    #>
+    param(
+        [Parameter(Mandatory = $true)][string]$Token,
+        [Parameter(Mandatory = $true)][string]$Uri
+    )
+
+    if ($env:FFC_CF_CACHE_BUST -eq '1') { return $null }
+    try {
+        $path = Get-CfCacheFilePath -Prefix 'http' -Text "$Token|$Uri"
+        if (-not (Test-Path -LiteralPath $path)) { return $null }
+        $age = (Get-Date).ToUniversalTime() - (Get-Item -LiteralPath $path).LastWriteTimeUtc
+        if ($age.TotalHours -ge $script:CfHttpCacheMaxAgeHours) { return $null }
+        $entry = Get-Content -LiteralPath $path -Raw | ConvertFrom-Json
+        if (-not $entry.ETag -or $null -eq $entry.Body) { return $null }
+        return $entry
+    }
+    catch {
+        return $null
+    }
+}
+
+function Write-CfHttpCache {
+    param(
+        [Parameter(Mandatory = $true)][string]$Token,
+        [Parameter(Mandatory = $true)][string]$Uri,
+        [Parameter(Mandatory = $true)][string]$ETag,
+        [Parameter(Mandatory = $true)][string]$Body
+    )
+
+    if ($env:FFC_CF_CACHE_BUST -eq '1') { return }
+    $path = Get-CfCacheFilePath -Prefix 'http' -Text "$Token|$Uri"
+    Remove-CfHttpCacheExpired -Directory (Split-Path -Parent $path)
+    # Body is the response's own JSON text, so it goes in as-is rather than as
+    # an escaped string: a read is then one ConvertFrom-Json, not two.
+    $json = '{"ETag":' + (ConvertTo-Json -InputObject $ETag -Compress) + ',"Body":' + $Body + '}'
+    Save-CfCacheFile -Path $path -Json $json
+}
+
 function Resolve-CfZone {
     <#
         Resolves a zone by probing each token in order (default: the FFC then
@@ -258,11 +633,26 @@ function Resolve-CfZone {
         throw 'No Cloudflare tokens available. Set CLOUDFLARE_API_TOKEN_FFC and/or CLOUDFLARE_API_TOKEN_CM, or pass -Tokens.'
     }
 
+    # Cached lookups first (in token order), so a warm run makes no probe at all.
+    foreach ($t in $Tokens) {
+        $cached = Read-CfZoneCache -Domain $Domain -Token $t.Token
+        if ($cached) {
+            return [pscustomobject]@{
+                Account  = $t.Name
+                Token    = $t.Token
+                ZoneId   = $cached.ZoneId
+                ZoneName = $cached.ZoneName
+            }
+        }
+    }
+
     foreach ($t in $Tokens) {
         try {
             $encoded = [uri]::EscapeDataString($Domain)
-            $resp = Invoke-CfApi -Method GET -Token $t.Token -Path "/zones?name=$encoded"
+            # Exact-name lookup and only result[0] is used: ask for one.
+            $resp = Invoke-CfApi -Method GET -Token $t.Token -Path "/zones?name=$encoded&per_page=1"
             if ($resp.success -and $resp.result -and $resp.result.Count -gt 0) {
+                Write-CfZoneCache -Domain $Domain -Token $t.Token -ZoneId $resp.result[0].id -ZoneName $resp.result[0].name
                 return [pscustomobject]@{
                     Account  = $t.Name
                     Token    = $t.Token
@@ -292,6 +682,66 @@ function Resolve-CfZoneId {
     return $null
 }
 
+# ---------------------------------------------------------------------------
+# Zone listing (paginated)
+# ---------------------------------------------------------------------------
+function Get-CfZones {
+    <#
+        Every zone the token can see. Page 1 reports total_pages; the
+        remaining pages are then independent, so on PowerShell 7 they are
+        fetched concurrently (-ThrottleLimit at a time), as Get-CfDnsRecords
+        does. Zones keep page order. /zones caps per_page at 50.
+        -Conditional: as for Get-CfDnsRecords, read-only listings only.
+    #>
+    [CmdletBinding()]
+    param(
+        [Parameter(Mandatory = $true)][string]$Token,
+        [ValidateRange(1, 8)]
+        [int]$ThrottleLimit = 4,
+        [switch]$Conditional
+    )
+
+    $basePath = '/zones?per_page=50'
+    $resp = Invoke-CfApi -Method GET -Token $Token -Path "$basePath&page=1" -Conditional:$Conditional
+    $zones = [System.Collections.Generic.List[object]]::new()
+    foreach ($z in @($resp.result)) { if ($null -ne $z) { $zones.Add($z) } }
+
+    $totalPages = 1
+    if ($resp.result_info -and $resp.result_info.total_pages) { $totalPages = [int]$resp.result_info.total_pages }
+    if ($totalPages -le 1) { return $zones.ToArray() }
+
+    $pages = 2..$totalPages
+    if ($PSVersionTable.PSVersion.Major -ge 7) {
+        # Outcomes rather than exceptions, as in Get-CfDnsRecords: a throw in a
+        # -Parallel block would silently drop that page.
+        $libPath = $script:CfLibPath
+        $conditionalPages = [bool]$Conditional
+        $outcomes = $pages | ForEach-Object -ThrottleLimit $ThrottleLimit -Parallel {
+            $lib = $using:libPath
+            . $lib
+            $pageNo = $_
+            try {
+                $pageResp = Invoke-CfApi -Method GET -Token $using:Token -Path ($using:basePath + "&page=$pageNo") -Conditional:$using:conditionalPages
+                [pscustomobject]@{ Page = $pageNo; Zones = @($pageResp.result); Error = $null }
+            }
+            catch {
+                [pscustomobject]@{ Page = $pageNo; Zones = @(); Error = "$_" }
+            }
+        }
+        foreach ($o in @($outcomes | Sort-Object Page)) {
+            if ($o.Error) { throw "Listing zones failed on page $($o.Page): $($o.Error)" }
+            foreach ($z in $o.Zones) { $zones.Add($z) }
+        }
+    }
+    else {
+        foreach ($pageNo in $pages) {
+            $pageResp = Invoke-CfApi -Method GET -Token $Token -Path "$basePath&page=$pageNo" -Conditional:$Conditional
+            foreach ($z in @($pageResp.result)) { if ($null -ne $z) { $zones.Add($z) } }
+        }
+    }
+    return $zones.ToArray()
+}
+
 # ---------------------------------------------------------------------------
 # DNS record listing (paginated)
 # ---------------------------------------------------------------------------
@@ -301,6 +751,17 @@ function Get-CfDnsRecords {
         (applied server-side by Cloudflare): -Type, -Name (FQDN), -Content.
         Returns the records; collect with @(Get-CfDnsRecords ...) — the array
         may be empty.
+
+        Page 1 reports total_pages; the remaining pages are independent, so on
+        PowerShell 7 they are fetched concurrently (-ThrottleLimit at a time)
+        instead of one round-trip after another. Records keep page order. A
+        caller that already runs inside its own parallel workers passes
+        -ThrottleLimit 1, so the two limits do not multiply.
+
+        -Conditional revalidates each page against the ETag cache (see
+        Invoke-CfApi). Only for read-only listings (exports, audits): a
+        listing that decides a write must see Cloudflare's current state, so
+        it goes without.
     #>
     [CmdletBinding()]
     param(
@@ -308,29 +769,144 @@ function Get-CfDnsRecords {
         [Parameter(Mandatory = $true)][string]$Token,
         [string]$Type,
         [string]$Name,
-        [string]$Content
+        [string]$Content,
+        [ValidateRange(1, 8)]
+        [int]$ThrottleLimit = 4,
+        [switch]$Conditional
     )
 
+    $query = @()
+    if ($Type) { $query += "type=$([uri]::EscapeDataString($Type))" }
+    if ($Name) { $query += "name=$([uri]::EscapeDataString($Name))" }
+    if ($Content) { $query += "content=$([uri]::EscapeDataString($Content))" }
+    $query += "per_page=$script:CfDnsRecordsPerPage"
+    $basePath = "/zones/$ZoneId/dns_records?$($query -join '&')"
+
+    $resp = Invoke-CfApi -Method GET -Token $Token -Path "$basePath&page=1" -Conditional:$Conditional
     $records = @()
-    $page = 1
-    while ($true) {
-        $query = @()
-        if ($Type) { $query += "type=$([uri]::EscapeDataString($Type))" }
-        if ($Name) { $query += "name=$([uri]::EscapeDataString($Name))" }
-        if ($Content) { $query += "content=$([uri]::EscapeDataString($Content))" }
-        $query += "per_page=100"
-        $query += "page=$page"
-
-        $resp = Invoke-CfApi -Method GET -Token $Token -Path "/zones/$ZoneId/dns_records?$($query -join '&')"
-        if ($resp.result) { $records += $resp.result }
-
-        $totalPages = 1
-        if (($resp.PSObject.Properties.Name -contains 'result_info') -and $resp.result_info -and
-            ($resp.result_info.PSObject.Properties.Name -contains 'total_pages') -and $resp.result_info.total_pages) {
-            $totalPages = [int]$resp.result_info.total_pages
+    if ($resp.result) { $records += $resp.result }
+
+    $totalPages = 1
+    if (($resp.PSObject.Properties.Name -contains 'result_info') -and $resp.result_info -and
+        ($resp.result_info.PSObject.Properties.Name -contains 'total_pages') -and $resp.result_info.total_pages) {
+        $totalPages = [int]$resp.result_info.total_pages
+    }
+    if ($totalPages -le 1) { return $records }
+
+    $pages = 2..$totalPages
+    if ($PSVersionTable.PSVersion.Major -ge 7 -and $ThrottleLimit -gt 1) {
+        # Each runspace returns an outcome instead of throwing: an exception in
+        # a -Parallel block only becomes a non-terminating error, which would
+        # silently drop that page's records.
+        $libPath = $script:CfLibPath
+        $conditionalPages = [bool]$Conditional
+        $outcomes = $pages | ForEach-Object -ThrottleLimit $ThrottleLimit -Parallel {
+            $lib = $using:libPath
+            . $lib
+            $pageNo = $_
+            $pagePath = $using:basePath + "&page=$pageNo"
+            try {
+                $pageResp = Invoke-CfApi -Method GET -Token $using:Token -Path $pagePath -Conditional:$using:conditionalPages
+                [pscustomobject]@{ Page = $pageNo; Records = @($pageResp.result); Error = $null }
+            }
+            catch {
+                [pscustomobject]@{ Page = $pageNo; Records = @(); Error = "$_" }
+            }
+        }
+        foreach ($o in @($outcomes | Sort-Object Page)) {
+            if ($o.Error) { throw "Listing DNS records for zone $ZoneId failed on page $($o.Page): $($o.Error)" }
+            $records += $o.Records
+        }
+    }
+    else {
+        foreach ($pageNo in $pages) {
+            $pageResp = Invoke-CfApi -Method GET -Token $Token -Path "$basePath&page=$pageNo" -Conditional:$Conditional
+            if ($pageResp.result) { $records += $pageResp.result }
         }
-        if ($page -ge $totalPages) { break }
-        $page++
     }
     return $records
 }
+
+# ---------------------------------------------------------------------------
+# DNS record deletion
+# ---------------------------------------------------------------------------
+function Remove-CfDnsRecords {
+    <#
+        Deletes DNS records by id. Returns one outcome per id, in input order:
+        [pscustomobject]@{ Id; Error }, Error $null on success. A failed
+        delete never throws; the caller reports it alongside the others.
+
+        The deletes are independent, so on PowerShell 7 they go out
+        concurrently (-ThrottleLimit at a time) instead of one round-trip
+        after another.
+    #>
+    [CmdletBinding()]
+    param(
+        [Parameter(Mandatory = $true)][string]$ZoneId,
+        [Parameter(Mandatory = $true)][string]$Token,
+        [Parameter(Mandatory = $true)][AllowEmptyCollection()][string[]]$RecordIds,
+        [ValidateRange(1, 8)]
+        [int]$ThrottleLimit = 4
+    )
+
+    $basePath = "/zones/$ZoneId/dns_records"
+    if ($PSVersionTable.PSVersion.Major -ge 7 -and $RecordIds.Count -gt 1) {
+        $libPath = $script:CfLibPath
+        $work = for ($i = 0; $i -lt $RecordIds.Count; $i++) { [pscustomobject]@{ Index = $i; Id = $RecordIds[$i] } }
+        $outcomes = $work | ForEach-Object -ThrottleLimit $ThrottleLimit -Parallel {
+            $lib = $using:libPath
+            . $lib
+            $item = $_
+            try {
+                $null = Invoke-CfApi -Method DELETE -Token $using:Token -Path ($using:basePath + "/$($item.Id)")
+                [pscustomobject]@{ Index = $item.Index; Id = $item.Id; Error = $null }
+            }
+            catch {
+                [pscustomobject]@{ Index = $item.Index; Id = $item.Id; Error = "$_" }
+            }
+        }
+        return @($outcomes | Sort-Object Index | Select-Object Id, Error)
+    }
+
+    foreach ($id in $RecordIds) {
+        try {
+            $null = Invoke-CfApi -Method DELETE -Token $Token -Path "$basePath/$id"
+            [pscustomobject]@{ Id = $id; Error = $null }
+        }
+        catch {
+            [pscustomobject]@{ Id = $id; Error = "$_" }
+        }
+    }
+}
+
+# ---------------------------------------------------------------------------
+# DNS record batch writes
+# ---------------------------------------------------------------------------
+function Invoke-CfDnsBatch {
+    <#
+        One POST /zones/{id}/dns_records/batch carrying record deletes
+        (-Deletes: record ids) and creates (-Posts: the same bodies
+        POST /dns_records takes). Cloudflare applies a batch as a single
+        transaction, deletes before creates. When Cloudflare refused it
+        (Test-CfRequestRefused: some tokens and plans refuse the batch
+        endpoint) nothing was written and the caller can fall back to one
+        call per record; after a timeout or 5xx the batch may have committed,
+        so the caller must re-read the records before replaying anything.
+        Returns the batch result (result.deletes / result.posts).
+    #>
+    [CmdletBinding()]
+    param(
+        [Parameter(Mandatory = $true)][string]$ZoneId,
+        [Parameter(Mandatory = $true)][string]$Token,
+        [string[]]$Deletes = @(),
+        [object[]]$Posts = @()
+    )
+
+    $body = @{}
+    if ($Deletes.Count -gt 0) { $body.deletes = @($Deletes | ForEach-Object { @{ id = $_ } }) }
+    if ($Posts.Count -gt 0) { $body.posts = @($Posts) }
+    if ($body.Count -eq 0) { return $null }
+
+    $resp = Invoke-CfApi -Method POST -Token $Token -Path "/zones/$ZoneId/dns_records/batch" -Body $body
+    return $resp.result
+}
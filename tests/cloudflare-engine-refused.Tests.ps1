@@ -0,0 +1,55 @@
+# Test-CfRequestRefused against the engine's own Invoke-CfApi
+# (Update-CloudflareDns.ps1), on its Windows PowerShell fallback path.
+#
+# WHY: Invoke-DnsRecordCreateBatch replays a failed batch record by record only
+# when Cloudflare refused it. The fallback path used to Write-Error under
+# ErrorActionPreference Stop, which swapped the exception for one without a
+# status, so every refusal there looked like "may have committed" and the
+# replay never ran. What must hold: a 4xx and a success=false envelope from
+# that path read as refused, and a 5xx does not.
+
+BeforeAll {
+    . (Join-Path $PSScriptRoot '..' 'scripts' 'cloudflare-api-common.ps1')
+    . (Join-Path $PSScriptRoot 'pester-helpers.ps1')
+    $source = (Resolve-Path (Join-Path $PSScriptRoot '..' 'Update-CloudflareDns.ps1')).Path
+    . ([scriptblock]::Create((Get-FunctionFromFile -Path $source -Name 'Invoke-CfApi').Extent.Text))
+
+    $ApiBase = 'https://api.cloudflare.com/client/v4'
+    $Headers = @{ Authorization = 'Bearer t' }
+    # Force the Invoke-RestMethod fallback.
+    $script:CanSkipHttpErrors = $false
+
+    # Replaces the cmdlet: an HTTP failure with $script:Status, or a 200
+    # carrying a success=false envelope when $script:Status is 200.
+    function Invoke-RestMethod {
+        param($Method, $Uri, $Headers, $ContentType, $TimeoutSec, $WebSession, $Body, $HttpVersion)
+        if ($script:Status -eq 200) {
+            return [pscustomobject]@{ success = $false; errors = @([pscustomobject]@{ code = 1004; message = 'DNS Validation Error' }) }
+        }
+        $response = [System.Net.Http.HttpResponseMessage]::new([System.Net.HttpStatusCode]$script:Status)
+        throw [Microsoft.PowerShell.Commands.HttpResponseException]::new("Response status code does not indicate success: $($script:Status).", $response)
+    }
+
+    function Get-BatchError {
+        try { $null = Invoke-CfApi -Method 'POST' -Uri '/zones/z/dns_records/batch' -Body @{ posts = @() } }
+        catch { return $_ }
+        throw 'Invoke-CfApi did not fail'
+    }
+}
+
+Describe 'Test-CfRequestRefused on the engine fallback path' {
+    It 'treats a 4xx as refused' {
+        $script:Status = 400
+        Test-CfRequestRefused -ErrorRecord (Get-BatchError) | Should -BeTrue
+    }
+
+    It 'treats a success=false envelope as refused' {
+        $script:Status = 200
+        Test-CfRequestRefused -ErrorRecord (Get-BatchError) | Should -BeTrue
+    }
+
+    It 'does not treat a 5xx as refused' {
+        $script:Status = 503
+        Test-CfRequestRefused -ErrorRecord (Get-BatchError) | Should -BeFalse
+    }
+}
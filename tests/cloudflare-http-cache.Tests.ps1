@@ -0,0 +1,89 @@
+# Conditional GETs in the library's Invoke-CfApi (scripts/cloudflare-api-common.ps1).
+#
+# WHY: a cron re-export lists every zone and every record set again although
+# almost nothing changed since the last run. With -Conditional the second run
+# sends If-None-Match and Cloudflare answers 304 with no body. What must NOT
+# change is what the caller gets back: the same parsed envelope whether it came
+# over the wire or out of the cache, and a plain request whenever there is
+# nothing cached (cold cache, FFC_CF_CACHE_BUST, or no -Conditional).
+
+BeforeAll {
+    . (Join-Path $PSScriptRoot '..' 'scripts' 'cloudflare-api-common.ps1')
+
+    # Replaces the cmdlet: a server whose listing carries ETag "v1" and which
+    # answers a matching If-None-Match with a bodiless 304, like Cloudflare.
+    function Invoke-RestMethod {
+        param($Method, $Uri, $Headers, $TimeoutSec, $WebSession, $ErrorAction, $Body, $ResponseHeadersVariable, $StatusCodeVariable)
+        $script:Requests.Add($Headers)
+        if ($Headers['If-None-Match'] -eq '"v1"') {
+            $response = [System.Net.Http.HttpResponseMessage]::new([System.Net.HttpStatusCode]::NotModified)
+            throw [Microsoft.PowerShell.Commands.HttpResponseException]::new('Response status code does not indicate success: 304 (Not Modified).', $response)
+        }
+        if ($ResponseHeadersVariable) { Set-Variable -Name $ResponseHeadersVariable -Scope 1 -Value @{ ETag = @('"v1"') } }
+        if ($StatusCodeVariable) { Set-Variable -Name $StatusCodeVariable -Scope 1 -Value 200 }
+        return [pscustomobject]@{ success = $true; result = @([pscustomobject]@{ id = 'rec-1'; name = 'example.org' }) }
+    }
+}
+
+Describe 'Invoke-CfApi -Conditional' {
+    BeforeEach {
+        $script:Requests = [System.Collections.Generic.List[object]]::new()
+        $env:FFC_CF_CACHE_DIR = Join-Path $TestDrive ([guid]::NewGuid().ToString('N'))
+        Remove-Item Env:FFC_CF_CACHE_BUST -ErrorAction SilentlyContinue
+    }
+
+    AfterAll {
+        Remove-Item Env:FFC_CF_CACHE_DIR -ErrorAction SilentlyContinue
+    }
+
+    It 'revalidates the second GET and returns the cached body on 304' {
+        $first = Invoke-CfApi -Method GET -Path '/zones/z/dns_records?page=1' -Token 't' -Conditional
+        $second = Invoke-CfApi -Method GET -Path '/zones/z/dns_records?page=1' -Token 't' -Conditional
+        $script:Requests.Count | Should -Be 2
+        $script:Requests[0].ContainsKey('If-None-Match') | Should -BeFalse
+        $script:Requests[1]['If-None-Match'] | Should -Be '"v1"'
+        $second.result[0].id | Should -Be $first.result[0].id
+        $second.success | Should -BeTrue
+    }
+
+    It 'does not add If-None-Match to the shared per-token headers' {
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        (Get-CfRequestHeaders -Token 't').ContainsKey('If-None-Match') | Should -BeFalse
+    }
+
+    It 'sends a plain request without -Conditional' {
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't'
+        $script:Requests[1].ContainsKey('If-None-Match') | Should -BeFalse
+    }
+
+    It 'ignores the cache when FFC_CF_CACHE_BUST=1' {
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $env:FFC_CF_CACHE_BUST = '1'
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $script:Requests[1].ContainsKey('If-None-Match') | Should -BeFalse
+    }
+
+    It 'ignores and prunes entries older than 24 hours' {
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $file = Get-ChildItem -Path $env:FFC_CF_CACHE_DIR -Filter 'http-*.json' | Select-Object -First 1
+        $file.LastWriteTimeUtc = (Get-Date).ToUniversalTime().AddHours(-25)
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $script:Requests[1].ContainsKey('If-None-Match') | Should -BeFalse
+
+        # The prune runs once per process; reset it as a fresh run would.
+        $stale = Join-Path $env:FFC_CF_CACHE_DIR 'http-stale.json'
+        Set-Content -LiteralPath $stale -Value '{}'
+        (Get-Item -LiteralPath $stale).LastWriteTimeUtc = (Get-Date).ToUniversalTime().AddHours(-25)
+        $script:CfHttpCachePruned = $false
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=2' -Token 't' -Conditional
+        Test-Path -LiteralPath $stale | Should -BeFalse
+    }
+
+    It 'keeps entries per token' {
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 't' -Conditional
+        $null = Invoke-CfApi -Method GET -Path '/zones?page=1' -Token 'other' -Conditional
+        $script:Requests[1].ContainsKey('If-None-Match') | Should -BeFalse
+    }
+}
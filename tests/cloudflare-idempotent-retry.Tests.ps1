@@ -0,0 +1,86 @@
+# Which failures the library's Invoke-CfApi retries (scripts/cloudflare-api-common.ps1).
+#
+# WHY: a 5xx or a timeout does not say whether Cloudflare applied the request.
+# Sending a GET/PUT/DELETE again is harmless, but sending a POST again can
+# create the record twice. What must hold: transient failures are retried for
+# idempotent methods (or a call marked -Idempotent) only, and a 429 (rejected
+# before it was applied) is retried for every method. The same line decides when a failed batch may be
+# replayed record by record: only after a refusal (Test-CfRequestRefused).
+
+BeforeAll {
+    . (Join-Path $PSScriptRoot '..' 'scripts' 'cloudflare-api-common.ps1')
+
+    # Replaces the cmdlet: answers with $script:Status until $script:FailCount
+    # requests have failed, then succeeds.
+    function Invoke-RestMethod {
+        param($Method, $Uri, $Headers, $TimeoutSec, $WebSession, $ErrorAction, $Body, $ContentType, $HttpVersion)
+        $script:Calls++
+        if ($script:Calls -le $script:FailCount) {
+            $response = [System.Net.Http.HttpResponseMessage]::new([System.Net.HttpStatusCode]$script:Status)
+            throw [Microsoft.PowerShell.Commands.HttpResponseException]::new("Response status code does not indicate success: $($script:Status).", $response)
+        }
+        return [pscustomobject]@{ success = $true; result = [pscustomobject]@{ id = 'rec-1' } }
+    }
+
+    function Start-Sleep { param($Milliseconds, $Seconds) }
+}
+
+Describe 'Invoke-CfApi retries' {
+    BeforeEach {
+        $script:Calls = 0
+        $script:FailCount = 1
+    }
+
+    It 'retries a GET after a 503' {
+        $script:Status = 503
+        $resp = Invoke-CfApi -Method GET -Path '/zones/z/dns_records' -Token 't' 3>$null
+        $resp.success | Should -BeTrue
+        $script:Calls | Should -Be 2
+    }
+
+    It 'does not retry a POST after a 503' {
+        $script:Status = 503
+        { Invoke-CfApi -Method POST -Path '/zones/z/dns_records' -Token 't' -Body @{ type = 'A' } } | Should -Throw
+        $script:Calls | Should -Be 1
+    }
+
+    It 'retries a PATCH marked -Idempotent after a 503' {
+        $script:Status = 503
+        $resp = Invoke-CfApi -Method PATCH -Path '/zones/z/dns_records/r' -Token 't' -Body @{ content = '192.0.2.1' } -Idempotent 3>$null
+        $resp.success | Should -BeTrue
+        $script:Calls | Should -Be 2
+    }
+
+    It 'retries a POST after a 429' {
+        $script:Status = 429
+        $resp = Invoke-CfApi -Method POST -Path '/zones/z/dns_records' -Token 't' -Body @{ type = 'A' } 3>$null
+        $resp.success | Should -BeTrue
+        $script:Calls | Should -Be 2
+    }
+}
+
+Describe 'Test-CfRequestRefused' {
+    BeforeEach {
+        $script:Calls = 0
+        $script:FailCount = 1
+    }
+
+    It 'treats a 4xx as refused' {
+        $script:Status = 400
+        try { $null = Invoke-CfApi -Method POST -Path '/zones/z/dns_records/batch' -Token 't' -Body @{ posts = @() } }
+        catch { $err = $_ }
+        Test-CfRequestRefused -ErrorRecord $err | Should -BeTrue
+    }
+
+    It 'does not treat a 5xx as refused' {
+        $script:Status = 503
+        try { $null = Invoke-CfApi -Method POST -Path '/zones/z/dns_records/batch' -Token 't' -Body @{ posts = @() } }
+        catch { $err = $_ }
+        Test-CfRequestRefused -ErrorRecord $err | Should -BeFalse
+    }
+
+    It 'does not treat a transport failure as refused' {
+        $err = [System.Management.Automation.ErrorRecord]::new([System.Net.Http.HttpRequestException]::new('The operation timed out.'), 'Timeout', 'OperationTimeout', $null)
+        Test-CfRequestRefused -ErrorRecord $err | Should -BeFalse
+    }
+}
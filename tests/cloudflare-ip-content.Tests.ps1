@@ -0,0 +1,38 @@
+# A/AAAA content validation in Update-CloudflareDns.ps1 (Test-DnsIpContent).
+#
+# WHY: a typo in -Content used to travel through the token probe and the zone
+# and record lookups before Cloudflare rejected it at the write. The check now
+# runs first, so it must reject what Cloudflare rejects -- including the
+# shorthand IPv4 forms .NET happily parses ('10.1' is 10.0.0.1) and scoped IPv6
+# -- without refusing any address a real record uses.
+
+BeforeAll {
+    $script:SourcePath = (Resolve-Path (Join-Path $PSScriptRoot '..' 'Update-CloudflareDns.ps1')).Path
+
+    . (Join-Path $PSScriptRoot 'pester-helpers.ps1')
+    . ([scriptblock]::Create((Get-FunctionFromFile -Path $script:SourcePath -Name 'Test-DnsIpContent').Extent.Text))
+}
+
+Describe 'Test-DnsIpContent' {
+    It 'accepts the GitHub Pages addresses' {
+        Test-DnsIpContent -Type A -Content '185.199.108.153' | Should -BeTrue
+        Test-DnsIpContent -Type AAAA -Content '2606:50c0:8000::153' | Should -BeTrue
+    }
+
+    It 'rejects shorthand IPv4 that .NET would parse' {
+        foreach ($value in @('1', '10.1', '10.0.1', '0x7f.0.0.1')) {
+            Test-DnsIpContent -Type A -Content $value | Should -BeFalse
+        }
+    }
+
+    It 'rejects an address of the other family' {
+        Test-DnsIpContent -Type A -Content '2606:50c0:8000::153' | Should -BeFalse
+        Test-DnsIpContent -Type AAAA -Content '185.199.108.153' | Should -BeFalse
+    }
+
+    It 'rejects scoped IPv6, hostnames, and empty content' {
+        Test-DnsIpContent -Type AAAA -Content 'fe80::1%eth0' | Should -BeFalse
+        Test-DnsIpContent -Type A -Content 'example.org' | Should -BeFalse
+        Test-DnsIpContent -Type A -Content '' | Should -BeFalse
+    }
+}
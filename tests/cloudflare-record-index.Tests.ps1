@@ -0,0 +1,60 @@
+# Record index used by -Audit and -EnforceStandard in Update-CloudflareDns.ps1.
+#
+# WHY: both paths used to answer every check with
+# `$allRecords | Where-Object { $_.type -eq X -and $_.name -eq Y }`, walking the
+# whole zone once per check and once per standard. The index replaces those
+# scans, so it has to return exactly what the scan returned -- including the
+# shapes callers lean on: nothing at all for an absent name (the provisioning
+# path), and case-insensitive name matching (Cloudflare lower-cases names, the
+# standards are built from whatever casing -Zone was given).
+
+BeforeAll {
+    $script:SourcePath = (Resolve-Path (Join-Path $PSScriptRoot '..' 'Update-CloudflareDns.ps1')).Path
+
+    . (Join-Path $PSScriptRoot 'pester-helpers.ps1')
+    foreach ($n in @('New-DnsRecordIndex', 'Get-IndexedDnsRecords')) {
+        . ([scriptblock]::Create((Get-FunctionFromFile -Path $script:SourcePath -Name $n).Extent.Text))
+    }
+
+    $script:Records = @(
+        [pscustomobject]@{ id = 'a1'; type = 'A'; name = 'example.org'; content = '192.0.2.1' }
+        [pscustomobject]@{ id = 'a2'; type = 'A'; name = 'example.org'; content = '192.0.2.2' }
+        [pscustomobject]@{ id = 'c1'; type = 'CNAME'; name = 'www.example.org'; content = 'example.github.io' }
+        [pscustomobject]@{ id = 't1'; type = 'TXT'; name = 'example.org'; content = 'v=spf1 -all' }
+    )
+}
+
+Describe 'New-DnsRecordIndex / Get-IndexedDnsRecords' {
+    It 'returns every record of the type at the name' {
+        $index = New-DnsRecordIndex -Records $script:Records
+        $a = @(Get-IndexedDnsRecords -Index $index -Type 'A' -Name 'example.org')
+        $a.id | Should -Be @('a1', 'a2')
+    }
+
+    It 'agrees with the Where-Object scan it replaces' {
+        $index = New-DnsRecordIndex -Records $script:Records
+        foreach ($probe in @(@('A', 'example.org'), @('CNAME', 'www.example.org'), @('TXT', 'example.org'), @('MX', 'example.org'))) {
+            $scan = @($script:Records | Where-Object { $_.type -eq $probe[0] -and $_.name -eq $probe[1] })
+            $indexed = @(Get-IndexedDnsRecords -Index $index -Type $probe[0] -Name $probe[1])
+            $indexed.Count | Should -Be $scan.Count
+            if ($scan.Count) { $indexed.id | Should -Be $scan.id }
+        }
+    }
+
+    It 'matches names and types case-insensitively, like -eq did' {
+        $index = New-DnsRecordIndex -Records $script:Records
+        (Get-IndexedDnsRecords -Index $index -Type 'cname' -Name 'WWW.Example.org').id | Should -Be 'c1'
+    }
+
+    It 'yields nothing (not an empty-array object) for an absent name' {
+        $index = New-DnsRecordIndex -Records $script:Records
+        $missing = Get-IndexedDnsRecords -Index $index -Type 'AAAA' -Name 'example.org'
+        $null -eq $missing | Should -BeTrue
+    }
+
+    It 'accepts a zone with no records at all' {
+        $index = New-DnsRecordIndex -Records $null
+        $index.Count | Should -Be 0
+        Get-IndexedDnsRecords -Index $index -Type 'A' -Name 'example.org' | Should -BeNullOrEmpty
+    }
+}
@@ -0,0 +1,39 @@
+# Retry pacing shared by both Invoke-CfApi copies (scripts/cloudflare-api-common.ps1).
+#
+# WHY: the bulk scripts fan out across parallel workers, and when Cloudflare
+# throttles one it usually throttles all of them at once. Plain exponential
+# backoff would bring them all back in the same second and get them throttled
+# again; the jitter spreads them out. What must hold: a Retry-After the server
+# sent always wins, the wait never drops below the un-jittered backoff, and it
+# stays bounded.
+
+BeforeAll {
+    . (Join-Path $PSScriptRoot '..' 'scripts' 'cloudflare-api-common.ps1')
+}
+
+Describe 'Get-CfRetryDelay' {
+    It 'waits exactly what Retry-After asked for' {
+        Get-CfRetryDelay -Attempt 1 -RetryAfter 7 | Should -Be 7
+    }
+
+    It 'clamps Retry-After to between 1 and 120 seconds' {
+        Get-CfRetryDelay -Attempt 1 -RetryAfter 0 | Should -Be 1
+        Get-CfRetryDelay -Attempt 1 -RetryAfter 3600 | Should -Be 120
+    }
+
+    It 'backs off exponentially with at most 25% jitter on top' {
+        foreach ($case in @(@(1, 1), @(2, 2), @(3, 4), @(4, 8))) {
+            1..20 | ForEach-Object {
+                $delay = Get-CfRetryDelay -Attempt $case[0]
+                $delay | Should -BeGreaterOrEqual $case[1]
+                $delay | Should -BeLessOrEqual ($case[1] * 1.25)
+            }
+        }
+    }
+
+    It 'caps the backoff at 30 seconds before jitter' {
+        $delay = Get-CfRetryDelay -Attempt 10
+        $delay | Should -BeGreaterOrEqual 30
+        $delay | Should -BeLessOrEqual 37.5
+    }
+}
@@ -0,0 +1,88 @@
+# On-disk zone-id cache behind Resolve-CfZone (scripts/cloudflare-api-common.ps1).
+#
+# WHY: every bulk/cache script resolves its zone with a /zones?name= probe per
+# token, on every run, although a zone id never changes while the zone exists.
+# The cache removes that probe on a warm run. What must NOT change is what the
+# caller gets back: the same Account/Token/ZoneId/ZoneName object, and a probe
+# whenever the cache has nothing trustworthy (cold, expired, busted, or cached
+# for a different token).
+
+BeforeAll {
+    . (Join-Path $PSScriptRoot '..' 'scripts' 'cloudflare-api-common.ps1')
+
+    # Replaces the library's REST call: one zone, visible to the FFC token only.
+    function Invoke-CfApi {
+        param([string]$Method, [string]$Path, [string]$Token, $Body)
+        $script:Probes++
+        if ($Token -eq 'ffc-token' -and $Path -like '/zones?name=example.org*') {
+            return [pscustomobject]@{ success = $true; result = @([pscustomobject]@{ id = 'zone-123'; name = 'example.org' }) }
+        }
+        return [pscustomobject]@{ success = $true; result = @() }
+    }
+
+    $script:Tokens = @(@{ Name = 'FFC'; Token = 'ffc-token' }, @{ Name = 'CM'; Token = 'cm-token' })
+}
+
+Describe 'Resolve-CfZone zone-id cache' {
+    BeforeEach {
+        $script:Probes = 0
+        $env:FFC_CF_CACHE_DIR = Join-Path $TestDrive ([guid]::NewGuid().ToString('N'))
+        Remove-Item Env:FFC_CF_CACHE_BUST -ErrorAction SilentlyContinue
+    }
+
+    AfterAll {
+        Remove-Item Env:FFC_CF_CACHE_DIR -ErrorAction SilentlyContinue
+    }
+
+    It 'probes on a cold cache and not on the next call' {
+        $first = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $script:Probes | Should -Be 1
+        $second = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $script:Probes | Should -Be 1
+        $second.ZoneId | Should -Be $first.ZoneId
+        $second.Account | Should -Be 'FFC'
+        $second.Token | Should -Be 'ffc-token'
+    }
+
+    It 'never writes the token to disk' {
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $files = @(Get-ChildItem -Path $env:FFC_CF_CACHE_DIR -File)
+        $files.Count | Should -Be 1
+        Get-Content -LiteralPath $files[0].FullName -Raw | Should -Not -Match 'ffc-token'
+    }
+
+    It 'ignores entries older than 24 hours' {
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $file = Get-ChildItem -Path $env:FFC_CF_CACHE_DIR -File | Select-Object -First 1
+        $file.LastWriteTimeUtc = (Get-Date).ToUniversalTime().AddHours(-25)
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $script:Probes | Should -Be 2
+    }
+
+    It 'still serves an expired entry to a caller that asks for it' {
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $file = Get-ChildItem -Path $env:FFC_CF_CACHE_DIR -File | Select-Object -First 1
+        $file.LastWriteTimeUtc = (Get-Date).ToUniversalTime().AddHours(-25)
+        Read-CfZoneCache -Domain 'example.org' -Token 'ffc-token' | Should -BeNullOrEmpty
+        (Read-CfZoneCache -Domain 'example.org' -Token 'ffc-token' -AllowExpired).ZoneId | Should -Be 'zone-123'
+    }
+
+    It 'bypasses the cache when FFC_CF_CACHE_BUST=1' {
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $env:FFC_CF_CACHE_BUST = '1'
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $script:Probes | Should -Be 2
+    }
+
+    It 'does not serve one token''s entry to a different token' {
+        $null = Resolve-CfZone -Domain 'example.org' -Tokens $script:Tokens
+        $cmOnly = Resolve-CfZone -Domain 'example.org' -Tokens @(@{ Name = 'CM'; Token = 'cm-token' })
+        $cmOnly | Should -BeNullOrEmpty
+    }
+
+    It 'caches nothing for a zone no token can see' {
+        $null = Resolve-CfZone -Domain 'missing.example' -Tokens $script:Tokens
+        $null = Resolve-CfZone -Domain 'missing.example' -Tokens $script:Tokens
+        $script:Probes | Should -Be 4
+    }
+}
@@ -0,0 +1,18 @@
+# Shared helpers for the Pester suites in this folder. Dot-source from a
+# BeforeAll block: . (Join-Path $PSScriptRoot 'pester-helpers.ps1')
+#
+# Not a *.Tests.ps1 file, so Pester never runs it on its own.
+
+function Get-FunctionFromFile {
+    # The named function's AST from a script, without running the script (the
+    # scripts under test do real work at top level). Dot-source its
+    # .Extent.Text to define just that function in the test scope.
+    param([Parameter(Mandatory)][string]$Path, [Parameter(Mandatory)][string]$Name)
+    $ast = [System.Management.Automation.Language.Parser]::ParseFile($Path, [ref]$null, [ref]$null)
+    $fn = $ast.Find({
+            param($n)
+            $n -is [System.Management.Automation.Language.FunctionDefinitionAst] -and $n.Name -eq $Name
+        }, $true)
+    if (-not $fn) { throw "$Name not found in $Path" }
+    return $fn
+}